@@ -2,6 +2,8 @@ import tkinter as tk
 import ttkbootstrap as ttk
 from PIL import Image, ImageTk
 import io
+import hashlib
+from collections import OrderedDict
 from typing import Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -11,6 +13,9 @@ if TYPE_CHECKING:
 class PreviewPanel(ttk.Frame):
     """Panel to display the Manim preview image and refresh button."""
 
+    # Max number of decoded preview images kept around for re-display
+    PHOTO_CACHE_SIZE = 8
+
     def __init__(self, parent, ui_manager: 'UIManager'):
         """Initialize the PreviewPanel.
 
@@ -22,9 +27,13 @@ class PreviewPanel(ttk.Frame):
         self.ui_manager = ui_manager
         self.canvas: Optional[tk.Canvas] = None
         self.refresh_button: Optional[ttk.Button] = None
-        self._photo_image = None # Keep reference to avoid GC
+        self._photo_image = None # Keep reference to avoid GC; None when no image shown
+        # Persistent canvas items, shown/hidden instead of recreated
         self._image_on_canvas = None
         self._placeholder_id = None
+        self._rendering_id = None
+        # Decoded PhotoImages keyed by a digest of the PNG bytes (LRU order)
+        self._photo_cache: 'OrderedDict[bytes, ImageTk.PhotoImage]' = OrderedDict()
 
         self._create_widgets()
         self._bind_events()
@@ -39,6 +48,28 @@ class PreviewPanel(ttk.Frame):
         self.canvas = tk.Canvas(self, bg="gray85", bd=1, relief="sunken")
         self.canvas.grid(row=0, column=0, sticky="nsew")
 
+        # Create the canvas items once; state transitions only toggle visibility
+        center_x, center_y = self._get_canvas_center()
+        self._image_on_canvas = self.canvas.create_image(
+            center_x, center_y,
+            state=tk.HIDDEN,
+            tags=("preview_image",)
+        )
+        self._placeholder_id = self.canvas.create_text(
+            center_x, center_y,
+            text="Click 'Refresh Preview' to see output",
+            fill="grey50",
+            state=tk.HIDDEN,
+            tags=("placeholder",) # Tag for finding in tests
+        )
+        self._rendering_id = self.canvas.create_text(
+            center_x, center_y,
+            text="Rendering Preview...",
+            fill="black",
+            state=tk.HIDDEN,
+            tags=("rendering_text",)
+        )
+
         self.refresh_button = ttk.Button(
             self,
             text="Refresh Preview",
@@ -51,47 +82,37 @@ class PreviewPanel(ttk.Frame):
         """Bind events."""
         if self.refresh_button:
             self.refresh_button.config(command=self.ui_manager.handle_refresh_preview_request)
-        # Bind configure to redraw placeholder like in Timeline
+        # Keep the canvas items centered when the canvas is resized
         if self.canvas:
-             self.canvas.bind("<Configure>", self._draw_placeholder)
-             
-    def _draw_placeholder(self, event=None):
-        """Draw placeholder text if no image is present."""
-        if not self.canvas:
-            return
-            
-        # If an image exists, don't draw placeholder
-        if self._image_on_canvas:
-            if self._placeholder_id:
-                 self.canvas.delete(self._placeholder_id)
-                 self._placeholder_id = None
-            return
-        
-        # Delete previous placeholder if switching back
-        if self._placeholder_id:
-             self.canvas.delete(self._placeholder_id)
-             self._placeholder_id = None
-             
+             self.canvas.bind("<Configure>", self._on_canvas_configure)
+
+    def _get_canvas_center(self) -> tuple[float, float]:
+        """Return the center of the canvas, falling back to its configured size."""
         canvas_width = self.canvas.winfo_width()
         canvas_height = self.canvas.winfo_height()
-        
-        # Fallback to configured size if needed
+        # Fallback to configured size if not rendered yet (e.g., 1x1 during init)
         if canvas_width <= 1: canvas_width = self.canvas.cget("width")
         if canvas_height <= 1: canvas_height = self.canvas.cget("height")
         try:
             canvas_width = int(canvas_width)
             canvas_height = int(canvas_height)
         except ValueError:
-             return # Cannot draw
-             
-        if canvas_width > 1 and canvas_height > 1:
-            placeholder_text = "Click 'Refresh Preview' to see output"
-            self._placeholder_id = self.canvas.create_text(
-                canvas_width / 2, canvas_height / 2,
-                text=placeholder_text,
-                fill="grey50",
-                tags=("placeholder",) # Tag for finding in tests
-            )
+            canvas_width, canvas_height = 300, 200 # Default if conversion fails
+        return canvas_width / 2, canvas_height / 2
+
+    def _on_canvas_configure(self, event=None):
+        """Re-center the persistent canvas items after a resize."""
+        if not self.canvas:
+            return
+        center_x, center_y = self._get_canvas_center()
+        for item_id in (self._image_on_canvas, self._placeholder_id, self._rendering_id):
+            self.canvas.coords(item_id, center_x, center_y)
+
+    def _show_only(self, item_id: int):
+        """Make item_id the only visible item among image, placeholder and rendering text."""
+        for canvas_id in (self._image_on_canvas, self._placeholder_id, self._rendering_id):
+            state = tk.NORMAL if canvas_id == item_id else tk.HIDDEN
+            self.canvas.itemconfigure(canvas_id, state=state)
 
     # --- Public Methods (Called by UIManager) ---
 
@@ -100,95 +121,56 @@ class PreviewPanel(ttk.Frame):
         if not self.canvas:
             return
             
-        # Clear previous items (placeholder, rendering text, or old image)
-        self.canvas.delete("placeholder")
-        self.canvas.delete("rendering_text")
-        if self._image_on_canvas:
-             self.canvas.delete(self._image_on_canvas)
-             self._image_on_canvas = None
-        if self._placeholder_id:
-             self._placeholder_id = None # Placeholder already deleted by tag
-
         try:
-            # Load image data
-            image = Image.open(io.BytesIO(image_bytes))
-            self._photo_image = ImageTk.PhotoImage(image) # Keep reference!
-
-            # Get canvas center coordinates
-            canvas_width = self.canvas.winfo_width()
-            canvas_height = self.canvas.winfo_height()
-            # Fallback to configured size if needed
-            if canvas_width <= 1: canvas_width = self.canvas.cget("width")
-            if canvas_height <= 1: canvas_height = self.canvas.cget("height")
-            try:
-                 canvas_width = int(canvas_width)
-                 canvas_height = int(canvas_height)
-            except ValueError:
-                 canvas_width, canvas_height = 300, 200 # Default if conversion fails
-                 
-            center_x = canvas_width / 2
-            center_y = canvas_height / 2
-            
-            # Create image on canvas
-            self._image_on_canvas = self.canvas.create_image(
-                center_x,
-                center_y,
-                image=self._photo_image,
-                tags=("preview_image",)
-            )
+            # Load image data (reuse the decoded image if we've seen these bytes)
+            self._photo_image = self._get_photo_image(image_bytes) # Keep reference!
+
+            # Point the existing image item at the new image; no items are created
+            self.canvas.itemconfigure(self._image_on_canvas, image=self._photo_image)
+            self._show_only(self._image_on_canvas)
             print(f"display_image: Displayed image with ID {self._image_on_canvas}") # Debug
 
         except Exception as e:
             print(f"[PreviewPanel Error] Failed to display image: {e}")
             # Optionally show an error message on the canvas
-            self._draw_placeholder() # Revert to placeholder on error
+            self._clear_image()
+            self._show_only(self._placeholder_id) # Revert to placeholder on error
+
+    def _clear_image(self):
+        """Detach the current image from the (hidden) image item."""
+        self._photo_image = None
+        self.canvas.itemconfigure(self._image_on_canvas, image="")
+
+    def _get_photo_image(self, image_bytes: bytes) -> ImageTk.PhotoImage:
+        """Return a PhotoImage for the PNG bytes, decoding only on a cache miss."""
+        # A 128-bit digest, not hash(): a collision would show the wrong preview
+        key = hashlib.blake2b(image_bytes, digest_size=16).digest()
+        photo = self._photo_cache.get(key)
+        if photo is not None:
+            self._photo_cache.move_to_end(key)
+            return photo
+
+        image = Image.open(io.BytesIO(image_bytes))
+        photo = ImageTk.PhotoImage(image)
+        self._photo_cache[key] = photo
+        if len(self._photo_cache) > self.PHOTO_CACHE_SIZE:
+            self._photo_cache.popitem(last=False) # Evict least recently used
+        return photo
 
     def show_rendering_state(self):
         """Update UI to show preview is rendering (disable button, update text)."""
         if self.refresh_button:
             self.refresh_button.config(state=tk.DISABLED)
         if self.canvas:
-            # Clear previous image/placeholder
-            if self._image_on_canvas:
-                self.canvas.delete(self._image_on_canvas)
-                self._image_on_canvas = None
-            if self._placeholder_id:
-                self.canvas.delete(self._placeholder_id)
-                self._placeholder_id = None
-            
-            # Draw "Rendering..." text
-            # TODO: Add a dedicated ID for rendering text if needed
-            canvas_width = self.canvas.winfo_width()
-            canvas_height = self.canvas.winfo_height()
-            # Use fallback size similar to _draw_placeholder
-            if canvas_width <= 1: canvas_width = self.canvas.cget("width")
-            if canvas_height <= 1: canvas_height = self.canvas.cget("height")
-            try:
-                canvas_width = int(canvas_width)
-                canvas_height = int(canvas_height)
-                if canvas_width > 1 and canvas_height > 1:
-                    # Ensure no duplicate rendering text exists
-                    self.canvas.delete("rendering_text") 
-                    self.canvas.create_text(
-                        canvas_width / 2, canvas_height / 2,
-                        text="Rendering Preview...",
-                        fill="black",
-                        tags=("rendering_text",) # Tag for finding/deleting
-                    )
-            except ValueError:
-                 pass # Cannot draw
+            # Clear previous image, swap placeholder for "Rendering..." text
+            self._clear_image()
+            self._show_only(self._rendering_id)
 
     def show_idle_state(self):
         """Update UI to show idle state (enable button, show placeholder/image)."""
         if self.refresh_button:
              self.refresh_button.config(state=tk.NORMAL)
         
-        # Remove rendering text if it exists
+        # Keep an existing image, otherwise fall back to the placeholder
         if self.canvas:
-             self.canvas.delete("rendering_text")
-             
-        # Decide whether to draw placeholder or keep existing image
-        if self._image_on_canvas:
-             pass # Keep image
-        else:
-             self._draw_placeholder() 
\ No newline at end of file
+             self._show_only(self._image_on_canvas if self._photo_image else self._placeholder_id)
@@ -1,7 +1,7 @@
 import tkinter as tk
 import ttkbootstrap as ttk
 from tkinter.colorchooser import askcolor
-from typing import Optional, Any, TYPE_CHECKING
+from typing import Optional, Any, Callable, Dict, TYPE_CHECKING
 
 if TYPE_CHECKING:
     # Avoid circular import at runtime, only needed for type hinting
@@ -36,6 +36,7 @@ class PropertiesPanel(ttk.Frame):
         self.ui_manager = ui_manager
         self.current_object_id: Optional[str] = None
         self.widgets = {} # Store property widgets for easy access/clearing
+        self._on_focus_out_handlers: Dict[str, Callable] = {} # Entry callbacks by property key
         self._placeholder_label = None
 
         # Create initial placeholder
@@ -65,6 +66,7 @@ class PropertiesPanel(ttk.Frame):
             
         # Reset internal references
         self.widgets = {}
+        self._on_focus_out_handlers = {}
         # if self._placeholder_label:
         #     self._placeholder_label.destroy() # Already destroyed by loop above
         self._placeholder_label = None
@@ -159,13 +161,13 @@ class PropertiesPanel(ttk.Frame):
             # Register the validation command
             vcmd = (self.register(self._validate_float), '%P') # %P is value_if_allowed
             entry.config(validate='key', validatecommand=vcmd) # Validate on each key press
-            # Bind FocusOut and Return to the general property change handler
-            entry.bind("<FocusOut>", lambda e, k=key: self._on_property_changed(e, k))
-            entry.bind("<Return>", lambda e, k=key: self._on_property_changed(e, k))
-        else:
-            # Bind text entry changes too
-            entry.bind("<FocusOut>", lambda e, k=key: self._on_property_changed(e, k))
-            entry.bind("<Return>", lambda e, k=key: self._on_property_changed(e, k))
+
+        # Bind FocusOut and Return to the general property change handler.
+        # Keep a reference so callers (and tests) can invoke it without the Tk event loop.
+        handler = lambda e, k=key: self._on_property_changed(e, k)
+        self._on_focus_out_handlers[key] = handler
+        entry.bind("<FocusOut>", handler)
+        entry.bind("<Return>", handler)
 
         return entry
 
@@ -213,8 +215,14 @@ class PropertiesPanel(ttk.Frame):
             return False
         
     def _on_property_changed(self, event, key: str, is_pos: bool = False, axis: Optional[int] = None):
-        """Handle Entry widget update (FocusOut, Return key)."""
-        widget = event.widget
+        """Handle Entry widget update (FocusOut, Return key).
+
+        event may be None when the handler is called directly; the entry is then
+        looked up by its property key.
+        """
+        widget = event.widget if event is not None else self.widgets.get(key)
+        if widget is None:
+            return
         # Check if widget still exists (it might have been destroyed by a quick subsequent selection)
         if not widget.winfo_exists():
             return
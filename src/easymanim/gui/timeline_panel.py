@@ -1,6 +1,6 @@
 import tkinter as tk
 import ttkbootstrap as ttk
-from typing import Optional
+from typing import Optional, Tuple
 
 class TimelinePanel(ttk.Frame):
     """A panel that displays object blocks on a timeline canvas."""
@@ -16,6 +16,8 @@ class TimelinePanel(ttk.Frame):
         self.ui_manager = ui_manager
         self.canvas = None
         self.object_canvas_items = {} # Map canvas item ID -> obj_id
+        self.rect_by_obj_id = {} # Reverse map obj_id -> rectangle item ID
+        self.highlighted_id: Optional[str] = None # obj_id of the highlighted block, if any
         self._placeholder_id = None
 
         self._create_widgets()
@@ -96,10 +98,15 @@ class TimelinePanel(ttk.Frame):
 
     # --- Public Methods (to be called by UIManager) ---
 
-    def add_block(self, obj_id: str, obj_type: str):
-        """Add a visual block representing an object to the timeline."""
+    def add_block(self, obj_id: str, obj_type: str) -> Optional[Tuple[int, int]]:
+        """Add a visual block representing an object to the timeline.
+
+        Returns:
+            The (rect_id, text_id) canvas item IDs of the new block, or None if
+            the canvas does not exist.
+        """
         if self.canvas is None:
-            return # Should not happen if initialized correctly
+            return None # Should not happen if initialized correctly
 
         # 1. Remove placeholder if it exists
         if self._placeholder_id:
@@ -143,11 +150,14 @@ class TimelinePanel(ttk.Frame):
 
         # 5. Store mapping (using rectangle ID as the primary reference)
         self.object_canvas_items[rect_id] = obj_id
+        self.rect_by_obj_id[obj_id] = rect_id
         # Optionally store text_id too if needed later, maybe map obj_id -> (rect_id, text_id)
 
         # 6. Update scroll region (important for potential future scrolling)
         self.canvas.config(scrollregion=self.canvas.bbox(tk.ALL))
 
+        return rect_id, text_id
+
     def highlight_block(self, selected_obj_id: Optional[str]):
         """Highlight the block corresponding to selected_obj_id, deselect others."""
         if not self.canvas:
@@ -158,24 +168,26 @@ class TimelinePanel(ttk.Frame):
         highlight_outline = "red"
         highlight_width = 2
 
-        # Iterate through all managed object blocks
-        for rect_id, obj_id in self.object_canvas_items.items():
+        # Only the previously highlighted block and the new one change style;
+        # every other block already has the default outline
+        previous_id, self.highlighted_id = self.highlighted_id, selected_obj_id
+        restyle = []
+        if previous_id is not None and previous_id != selected_obj_id:
+            restyle.append((previous_id, default_outline, default_width))
+        if selected_obj_id is not None:
+            restyle.append((selected_obj_id, highlight_outline, highlight_width))
+
+        for obj_id, outline, width in restyle:
+            rect_id = self.rect_by_obj_id.get(obj_id)
+            if rect_id is None:
+                continue # No block for this object
             try:
-                # Check if item still exists and is a rectangle
-                if self.canvas.type(rect_id) == "rectangle":
-                    if obj_id == selected_obj_id:
-                        # Apply highlight style
-                        self.canvas.itemconfig(rect_id, outline=highlight_outline, width=highlight_width)
-                        # Optional: Raise the selected item to the top
-                        # self.canvas.tag_raise(rect_id)
-                        # if text_id: self.canvas.tag_raise(text_id) # Need text_id mapping too
-                    else:
-                        # Apply default style
-                        self.canvas.itemconfig(rect_id, outline=default_outline, width=default_width)
+                self.canvas.itemconfig(rect_id, outline=outline, width=width)
+                # Optional: Raise the selected item to the top
+                # self.canvas.tag_raise(rect_id)
             except tk.TclError:
                 # Item might have been deleted externally? Log or ignore.
                 print(f"[TimelinePanel Warning] Could not configure item {rect_id} during highlight.")
-                continue
 
     # --- Event Handlers ---
 
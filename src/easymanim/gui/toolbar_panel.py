@@ -1,5 +1,6 @@
 import tkinter as tk
 import ttkbootstrap as ttk
+from typing import Dict
 
 # Assuming UIManager is in src/easymanim/ui/ui_manager.py
 # We need it for type hinting potentially, but not runtime logic here
@@ -17,6 +18,7 @@ class ToolbarPanel(ttk.Frame):
         """
         super().__init__(parent)
         self.ui_manager = ui_manager
+        self.buttons: Dict[str, ttk.Button] = {} # Add-object buttons keyed by object type
 
         self._create_widgets()
 
@@ -28,32 +30,17 @@ class ToolbarPanel(ttk.Frame):
         # style.configure('Toolbar.TButton', padding=5)
 
         # --- Add Object Buttons ---
-        add_circle_btn = ttk.Button(
-            self,
-            text="Add Circle",
-            command=lambda: self.ui_manager.handle_add_object_request('Circle'),
-            # style='Toolbar.TButton'
-            bootstyle="info"
-        )
-        add_circle_btn.pack(side=tk.LEFT, padx=5, pady=5)
-
-        add_square_btn = ttk.Button(
-            self,
-            text="Add Square",
-            command=lambda: self.ui_manager.handle_add_object_request('Square'),
-            # style='Toolbar.TButton'
-            bootstyle="info"
-        )
-        add_square_btn.pack(side=tk.LEFT, padx=5, pady=5)
-
-        add_text_btn = ttk.Button(
-            self,
-            text="Add Text",
-            command=lambda: self.ui_manager.handle_add_object_request('Text'),
-            # style='Toolbar.TButton'
-            bootstyle="info"
-        )
-        add_text_btn.pack(side=tk.LEFT, padx=5, pady=5)
+        # Keep references keyed by object type so callers don't need to scan children
+        for obj_type in ('Circle', 'Square', 'Text'):
+            add_btn = ttk.Button(
+                self,
+                text=f"Add {obj_type}",
+                command=lambda t=obj_type: self.ui_manager.handle_add_object_request(t),
+                # style='Toolbar.TButton'
+                bootstyle="info"
+            )
+            add_btn.pack(side=tk.LEFT, padx=5, pady=5)
+            self.buttons[obj_type] = add_btn
 
         # Add more buttons as needed (e.g., shapes, controls)
 
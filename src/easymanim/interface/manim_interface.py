@@ -1,19 +1,38 @@
 # src/easymanim/interface/manim_interface.py
 """Handles executing Manim rendering commands asynchronously."""
 
+import sys
 import threading
+import concurrent.futures
+import contextlib
 import subprocess
 import os
 import tempfile
 import pathlib
-from typing import TYPE_CHECKING, Callable, Union, List, Literal
+import hashlib
+import shutil
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, Callable, Union, List, Literal, Dict, Tuple, Optional
 
 # Avoid circular import for type hinting
 if TYPE_CHECKING:
     from easymanim.main_app import MainApplication # Assuming MainApplication is defined here
 
+# Set once the background `import manim` has been started for this process
+_IMPORT_WARMED = False
+
 class ManimInterface:
-    """Manages the execution of Manim CLI commands in background threads."""
+    """Manages the execution of Manim CLI commands on background worker threads."""
+
+    # Requests for the same scene/flags/format arriving within this window (seconds)
+    # share a single Manim run: rapid preview clicks pay Manim's startup once.
+    COALESCE_WINDOW_S = 0.05
+    # Successful results kept for repeat renders of an unchanged script (LRU)
+    RESULT_CACHE_SIZE = 16
+    # Content-addressed scripts kept in temp_script_dir before the oldest are pruned
+    SCRIPT_CACHE_SIZE = 32
+    # Only the end of Manim's output is decoded into a failure message (bytes per stream)
+    ERROR_TAIL_BYTES = 4096
     
     def __init__(self, root_app: 'MainApplication'):
         """Initializes the ManimInterface.
@@ -23,14 +42,117 @@ class ManimInterface:
                       UI updates from background threads.
         """
         self.root_app: 'MainApplication' = root_app
+
+        # Run Manim with the app's own interpreter: no PATH lookup per render,
+        # and the venv that has Manim installed is the one that gets used
+        self._python: str = sys.executable or 'python'
         
         # Create a dedicated temporary directory for scripts
-        # This directory will be managed by the OS's temp system
-        temp_dir_path_str = tempfile.mkdtemp(prefix="easymanim_scripts_")
+        # Prefer RAM-backed /dev/shm (Linux) so script writes never hit the disk;
+        # otherwise fall back to the OS's normal temp location.
+        temp_dir_path_str = tempfile.mkdtemp(prefix="easymanim_scripts_", dir=self._script_dir_base())
         self.temp_script_dir: pathlib.Path = pathlib.Path(temp_dir_path_str)
-        
-        # Optional: Add cleanup for this dir? Maybe later if needed.
-        # For now, rely on OS temp cleanup or manual deletion if issues arise.
+        self._temp_script_dir_str = temp_dir_path_str # For per-render string path ops
+
+        # Import Manim once in a throwaway process so its modules and native
+        # libraries are in the OS page cache before the first real render.
+        # The handle is kept so close() can stop and reap it.
+        self._warmup_process: Optional[subprocess.Popen] = self._warm_manim_import()
+        # temp_script_dir lives until close() (called on app shutdown) removes it
+
+        # Requests waiting for the coalescing window to close:
+        # (scene_name, output_format, flags) -> (newest script_content, callbacks)
+        self._pending: Dict[Tuple[str, str, Tuple[str, ...]], Tuple[str, List[Callable]]] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        # Set by close(), under _pending_lock; no render is started afterwards
+        self._closed = False
+
+        # Bounded pool for Manim runs: rapid requests queue up instead of each
+        # spawning its own thread (and Manim subprocess) at once
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(2, (os.cpu_count() or 2) // 2),
+            thread_name_prefix='manim'
+        )
+
+        # (script_hash, scene_name, flags, output_format) -> PNG bytes or MP4 path
+        self._result_cache: 'OrderedDict[Tuple[str, str, Tuple[str, ...], str], Union[bytes, str]]' = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        # Newest run per (scene_name, output_format): starting a render bumps the
+        # generation and terminates the older Manim process still working on it
+        self._in_flight: Dict[Tuple[str, str], subprocess.Popen] = {}
+        self._generations: Dict[Tuple[str, str], int] = {}
+        # Callbacks the newest run reports to, including those of the runs it superseded
+        self._waiting: Dict[Tuple[str, str], List[Callable]] = {}
+        # Script path -> number of queued or running jobs using it; these are never pruned
+        self._scripts_in_use: Dict[str, int] = {}
+        self._in_flight_lock = threading.Lock()
+
+        # Finished results waiting for the main thread. Workers only append;
+        # one scheduled drain runs every queued callback, so a burst of
+        # completions costs a single Tk event instead of one each.
+        self._result_queue: 'deque[Tuple[Callable, bool, Union[bytes, str]]]' = deque()
+        self._drain_scheduled = False
+
+    def close(self):
+        """Releases the interface's resources; call once when the app shuts down.
+
+        Drops requests still waiting to be coalesced or queued in the pool,
+        terminates running Manim processes, and removes temp_script_dir with
+        every cached script in it. /dev/shm is RAM, so a directory left behind
+        would hold memory until reboot. Render requests made afterwards are
+        ignored.
+        """
+        with self._pending_lock:
+            self._closed = True
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self._pending.clear()
+            # The pool's workers are non-daemon: without cancelling, exiting the app
+            # would wait for every queued render to finish. Shut down under the
+            # lock, so a timer that already fired can't submit in between.
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        with self._in_flight_lock:
+            running, self._in_flight = list(self._in_flight.values()), {}
+            self._waiting.clear()
+        for process in running:
+            if process.poll() is None:
+                process.terminate()
+        # Reap the warm-up import so it doesn't linger as a zombie
+        warmup, self._warmup_process = self._warmup_process, None
+        if warmup is not None:
+            if warmup.poll() is None:
+                warmup.terminate()
+            try:
+                warmup.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                warmup.kill()
+                warmup.wait()
+        shutil.rmtree(self.temp_script_dir, ignore_errors=True)
+
+    def _warm_manim_import(self) -> Optional[subprocess.Popen]:
+        """Starts a detached `import manim` the first time an interface is created."""
+        global _IMPORT_WARMED
+        if _IMPORT_WARMED:
+            return None
+        _IMPORT_WARMED = True
+        try:
+            return subprocess.Popen([self._python, '-c', 'import manim'],
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                    start_new_session=True)
+        except OSError as e:
+            print(f"[ManimInterface Warning] Could not warm up Manim import: {e}")
+            return None
+
+    @staticmethod
+    def _script_dir_base() -> str:
+        """Return the parent directory for the script temp dir."""
+        shm = '/dev/shm'
+        if os.path.isdir(shm) and os.access(shm, os.W_OK):
+            return shm
+        return tempfile.gettempdir()
 
     def render_async(self, 
                      script_content: str, 
@@ -38,10 +160,17 @@ class ManimInterface:
                      quality_flags: List[str], 
                      output_format: Literal['png', 'mp4'], 
                      callback: Callable[[bool, Union[bytes, str]], None]):
-        """Renders a Manim script asynchronously in a background thread.
+        """Renders a Manim script asynchronously on a background worker thread.
 
-        Creates a temporary script file, starts a thread to run the Manim 
-        command, and schedules a callback on the main thread upon completion.
+        The request is queued for COALESCE_WINDOW_S; requests for the same
+        scene, flags and format arriving in that window are merged so only the
+        newest script is rendered and every callback receives its result. The
+        flush then creates a temporary script file, submits the Manim command
+        to a bounded worker pool, and schedules the callback(s) on the main
+        thread upon completion. A later request for the same scene and format
+        supersedes this one: the older Manim run is stopped, and its callback
+        receives the newer request's result instead, so results never arrive
+        out of order and every callback is still called once.
 
         Args:
             script_content: The Manim script content as a string.
@@ -55,51 +184,315 @@ class ManimInterface:
                         output_format='png', output video *path* (str) if success 
                         and output_format='mp4', or an error message (str) if failure.
         """
+        # An unchanged script rendered with the same settings needs no Manim run at all
+        cache_key = (self._script_hash(script_content), scene_name, tuple(quality_flags), output_format)
+        cached = self._get_cached_result(cache_key)
+        if cached is not None:
+            print(f"Reusing cached {output_format} result for {scene_name}")
+            # Older requests for this scene, still waiting or running, would
+            # report after this result: answer them with it instead
+            job_key = (scene_name, output_format)
+            with self._pending_lock:
+                stale_keys = [key for key in self._pending if key[:2] == job_key]
+                callbacks = [cb for key in stale_keys for cb in self._pending.pop(key)[1]]
+            generation = self._supersede(job_key, callback)
+            callbacks.extend(self._claim_callbacks(job_key, generation, callback) or ())
+            for cb in callbacks:
+                self._post_result(cb, True, cached)
+            return
+
+        key = (scene_name, output_format, tuple(quality_flags))
+        with self._pending_lock:
+            if self._closed:
+                return
+            _, callbacks = self._pending.get(key, (None, []))
+            callbacks.append(callback)
+            self._pending[key] = (script_content, callbacks) # Newest script wins
+
+            # Restart the window on every request (trailing debounce)
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+            self._flush_timer = threading.Timer(self.COALESCE_WINDOW_S, self._flush_pending)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _flush_pending(self):
+        """Start one render per coalesced request key. Runs on the timer thread."""
+        with self._pending_lock:
+            if self._closed:
+                return # Timer fired while close() was running
+            if self._flush_timer is not None:
+                self._flush_timer.cancel() # No-op when called from the timer itself
+                self._flush_timer = None
+            pending, self._pending = self._pending, {}
+
+        for (scene_name, output_format, flags), (script_content, callbacks) in pending.items():
+            if len(callbacks) == 1:
+                callback = callbacks[0]
+            else:
+                print(f"Coalesced {len(callbacks)} render requests for {scene_name} ({output_format})")
+                def callback(success, result, _callbacks=callbacks):
+                    for cb in _callbacks:
+                        cb(success, result)
+            self._start_render(script_content, scene_name, list(flags), output_format, callback)
+
+    def _start_render(self,
+                      script_content: str,
+                      scene_name: str,
+                      quality_flags: List[str],
+                      output_format: Literal['png', 'mp4'],
+                      callback: Callable[[bool, Union[bytes, str]], None]):
+        """Write the script to a temp file and submit the Manim run to the pool."""
+        if self._closed:
+            return
         temp_script_path_str = None # Define variable outside try block
+        job_key = (scene_name, output_format)
+        generation = None
         try:
-            # Create a temporary file to store the script
-            # delete=False is important because we need the file path to exist 
-            # after the 'with' block to pass to the subprocess.
-            # The thread running the subprocess will be responsible for deleting it.
-            with tempfile.NamedTemporaryFile(mode='w', 
-                                          suffix='.py', 
-                                          delete=False, 
-                                          dir=str(self.temp_script_dir),
-                                          encoding='utf-8') as temp_script:
-                temp_script.write(script_content)
-                temp_script_path_str = temp_script.name
-                # temp_script is automatically closed upon exiting the 'with' block
-
-            # --- Start the background thread --- 
-            thread = threading.Thread(
-                target=self._run_manim_thread,
-                args=(
-                    temp_script_path_str, 
-                    scene_name, 
-                    quality_flags, 
-                    output_format, 
-                    callback
+            # Scripts are named by content hash: an unchanged script is written once,
+            # and Manim's media/<stem> output directory stays stable across renders.
+            # These files are kept (see _prune_script_cache), not deleted per render.
+            temp_script_path_str = self._script_path(script_content)
+            # Held until _run_manim_thread finishes, so pruning can't remove it first
+            self._hold_script(temp_script_path_str)
+            self._write_script(script_content, temp_script_path_str)
+
+            # --- Hand the run to the worker pool --- 
+            # Any older run for this scene/format is now stale: stop it early
+            generation = self._supersede(job_key, callback)
+            with self._pending_lock:
+                if self._closed: # close() ran while the script was being written
+                    self._release_script(temp_script_path_str)
+                    return
+                self._pool.submit(
+                    self._run_manim_thread,
+                    temp_script_path_str,
+                    scene_name,
+                    quality_flags,
+                    output_format,
+                    callback,
+                    generation
                 )
-            )
-            thread.start()
             
-            # Note: Cleanup of temp_script_path_str is now the responsibility 
-            # of _run_manim_thread after the subprocess finishes.
+            # Note: Scripts outside temp_script_dir are cleaned up by
+            # _run_manim_thread after the subprocess finishes.
 
         except Exception as e:
             # Handle exceptions during file writing or thread setup
             # Ensure callback is still called with failure
             error_message = f"Error setting up render: {e}"
             print(f"[ManimInterface Error] {error_message}") # Log error
-            # Ensure cleanup happens even if thread start fails
-            if temp_script_path_str and os.path.exists(temp_script_path_str):
-                 try:
-                     os.remove(temp_script_path_str)
-                     print(f"Cleaned up failed script: {temp_script_path_str}")
-                 except OSError as remove_error:
-                     print(f"Error cleaning up failed script {temp_script_path_str}: {remove_error}")
-            # Schedule the callback in the main thread
-            self.root_app.schedule_task(callback, False, error_message)
+            # Ensure cleanup happens even if thread start fails, unless another
+            # job still needs the same script
+            if temp_script_path_str and self._release_script(temp_script_path_str):
+                try:
+                    os.unlink(temp_script_path_str)
+                    print(f"Cleaned up failed script: {temp_script_path_str}")
+                except FileNotFoundError:
+                    pass # Never written
+                except OSError as remove_error:
+                    print(f"Error cleaning up failed script {temp_script_path_str}: {remove_error}")
+            # Schedule the callback(s) in the main thread; if a newer render
+            # already took them over, it reports instead
+            for cb in self._claim_callbacks(job_key, generation, callback) or ():
+                self._post_result(cb, False, error_message)
+
+    def _script_path(self, script_content: str) -> str:
+        """Returns the content-addressed path of a script in temp_script_dir."""
+        return os.path.join(self._temp_script_dir_str, f"{self._script_hash(script_content)}.py")
+
+    def _write_script(self, script_content: str, script_path: Optional[str] = None) -> str:
+        """Writes a script to its content-addressed path in temp_script_dir.
+
+        The file only appears under its final name once fully written, so a
+        concurrent render of the same script never reads a partial file. Where
+        supported (Linux) the data goes into an unnamed O_TMPFILE that is then
+        linked into place; otherwise a named temp file is renamed over it.
+
+        Args:
+            script_content: The Manim script content as a string.
+            script_path: Its _script_path, if the caller already computed it.
+
+        Returns:
+            The script path as a string.
+        """
+        if script_path is None:
+            script_path = self._script_path(script_content)
+        try:
+            # Written by an earlier render: refresh its mtime so pruning is LRU
+            os.utime(script_path)
+            return script_path
+        except FileNotFoundError:
+            pass
+
+        data = script_content.encode('utf-8')
+        if not self._link_tmpfile(data, script_path):
+            with tempfile.NamedTemporaryFile('wb', dir=self.temp_script_dir,
+                                             suffix='.tmp', delete=False) as f:
+                f.write(data)
+            os.replace(f.name, script_path)
+
+        self._prune_script_cache()
+        return script_path
+
+    def _link_tmpfile(self, data: bytes, script_path: str) -> bool:
+        """Writes data to an unnamed O_TMPFILE and links it in as script_path.
+
+        Returns:
+            False if O_TMPFILE or linking through /proc is unavailable here,
+            in which case nothing was written.
+        """
+        if not hasattr(os, 'O_TMPFILE'):
+            return False
+        try:
+            fd = os.open(self.temp_script_dir, os.O_TMPFILE | os.O_WRONLY, 0o600)
+        except OSError:
+            return False # Filesystem without O_TMPFILE support
+        try:
+            with open(fd, 'wb', closefd=False) as f:
+                f.write(data)
+            os.link(f"/proc/self/fd/{fd}", script_path)
+        except FileExistsError:
+            pass # Same content linked in concurrently
+        except OSError:
+            return False # e.g. /proc not mounted or linking across it refused
+        finally:
+            os.close(fd)
+        return True
+
+    def _hold_script(self, script_path: str):
+        """Marks script_path as needed by a queued or running job."""
+        with self._in_flight_lock:
+            self._scripts_in_use[script_path] = self._scripts_in_use.get(script_path, 0) + 1
+
+    def _release_script(self, script_path: str) -> bool:
+        """Drops one hold on script_path.
+
+        Returns:
+            True if no job holds the script any more.
+        """
+        with self._in_flight_lock:
+            count = self._scripts_in_use.get(script_path, 0) - 1
+            if count > 0:
+                self._scripts_in_use[script_path] = count
+                return False
+            self._scripts_in_use.pop(script_path, None)
+            return True
+
+    def _supersede(self, job_key: Tuple[str, str], callback: Optional[Callable] = None) -> int:
+        """Starts a new generation for job_key and terminates its running process.
+
+        Callbacks still waiting on older generations carry over to the new
+        one, together with callback.
+
+        Returns:
+            The generation number the new run must carry.
+        """
+        with self._in_flight_lock:
+            generation = self._generations.get(job_key, 0) + 1
+            self._generations[job_key] = generation
+            if callback is not None:
+                self._waiting.setdefault(job_key, []).append(callback)
+            stale = self._in_flight.pop(job_key, None)
+        if stale is not None and stale.poll() is None:
+            print(f"Cancelling stale render for {job_key[0]} ({job_key[1]})")
+            stale.terminate()
+        return generation
+
+    def _is_current(self, job_key: Tuple[str, str], generation: Optional[int]) -> bool:
+        """Returns False once a newer render for job_key has been started."""
+        if generation is None: # Untracked run (called directly)
+            return True
+        with self._in_flight_lock:
+            return self._generations.get(job_key) == generation
+
+    def _claim_callbacks(self, job_key: Tuple[str, str], generation: Optional[int],
+                         callback: Callable) -> Optional[List[Callable]]:
+        """Takes the callbacks a finished run must report its result to.
+
+        Returns:
+            [callback] for an untracked run, every callback waiting on job_key
+            if generation is still the newest, or None if it was superseded
+            (the newer run reports to them instead).
+        """
+        if generation is None: # Untracked run (called directly)
+            return [callback]
+        with self._in_flight_lock:
+            if self._generations.get(job_key) != generation:
+                return None
+            return self._waiting.pop(job_key, [])
+
+    def _post_result(self, callback: Callable, success: bool, result: Union[bytes, str]):
+        """Queues a result for the main thread, scheduling a drain if none is pending.
+
+        Safe to call from worker threads: deque.append is atomic in CPython.
+        """
+        self._result_queue.append((callback, success, result))
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            self.root_app.schedule_task(self._drain_results)
+
+    def _drain_results(self):
+        """Runs every queued result callback. Executes on the Tk main thread."""
+        # Clear the flag first so results posted while draining schedule a new pass
+        self._drain_scheduled = False
+        while self._result_queue:
+            callback, success, result = self._result_queue.popleft()
+            try:
+                callback(success, result)
+            except Exception as e:
+                print(f"[ManimInterface Error] Result callback failed: {e}")
+
+    @staticmethod
+    def _script_hash(script_content: str) -> str:
+        """Return the content hash used to name cached scripts."""
+        return hashlib.blake2b(script_content.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _is_cached_script(self, script_path: str) -> bool:
+        """True if script_path is a content-addressed script in temp_script_dir."""
+        return os.path.dirname(script_path) == self._temp_script_dir_str
+
+    def _get_cached_result(self, cache_key) -> Optional[Union[bytes, str]]:
+        """Return a cached result for cache_key, or None on a miss."""
+        with self._cache_lock:
+            result = self._result_cache.get(cache_key)
+            if result is None:
+                return None
+            # A cached video path is only useful while the file is still there
+            if isinstance(result, str) and not os.path.exists(result):
+                del self._result_cache[cache_key]
+                return None
+            self._result_cache.move_to_end(cache_key)
+            return result
+
+    def _store_result(self, cache_key, result: Union[bytes, str]):
+        """Remember a successful result, evicting the least recently used entry."""
+        with self._cache_lock:
+            self._result_cache[cache_key] = result
+            self._result_cache.move_to_end(cache_key)
+            while len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+
+    def _prune_script_cache(self):
+        """Delete the least recently used scripts beyond SCRIPT_CACHE_SIZE.
+
+        Scripts held by a queued or running job are never deleted, even if
+        that leaves the cache over its size for a while.
+        """
+        try:
+            with os.scandir(self.temp_script_dir) as it:
+                scripts = [e for e in it if e.name.endswith('.py') and e.is_file()]
+            excess = len(scripts) - self.SCRIPT_CACHE_SIZE
+            if excess <= 0:
+                return
+            with self._in_flight_lock:
+                held = set(self._scripts_in_use)
+            candidates = [e for e in scripts if e.path not in held]
+            candidates.sort(key=lambda e: e.stat().st_mtime)
+            for entry in candidates[:excess]:
+                os.remove(entry.path)
+        except OSError as e:
+            print(f"[ManimInterface Warning] Failed to prune script cache: {e}")
 
     def _get_quality_directory(self, flags: List[str]) -> str:
         """Determines the Manim media quality directory based on flags."""
@@ -119,18 +512,86 @@ class ManimInterface:
             print("[Manim Thread Warning] Could not determine quality directory from flags. Defaulting to 480p.")
             return "480p" 
 
+    @classmethod
+    def _read_tail(cls, f) -> str:
+        """Decodes the last ERROR_TAIL_BYTES of a captured output file.
+
+        The traceback that explains a failure is at the end of Manim's output,
+        so the (possibly long) progress log before it is never read or decoded.
+        """
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - cls.ERROR_TAIL_BYTES))
+        return f.read().decode('utf-8', errors='replace')
+
+    def _find_png(self, script_stem: str, scene_name: str) -> Optional[str]:
+        """Returns the path of the preview PNG Manim wrote for scene_name, or None."""
+        # Manim convention: media/images/<script_stem>/<scene_name>*.png
+        # Assuming execution from project root where 'media' would be
+        images_dir = os.path.join('.', 'media', 'images', script_stem)
+        # Exact name first (one stat); only scan the directory for a
+        # suffixed variant (e.g. version-stamped) if that misses.
+        output_file = os.path.join(images_dir, f"{scene_name}.png")
+        if os.path.exists(output_file):
+            return output_file
+        try:
+            with os.scandir(images_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.endswith('.png') and name.startswith(scene_name):
+                        return entry.path
+        except FileNotFoundError:
+            pass # No images directory at all
+        return None
+
+    def _find_mp4(self, script_stem: str, scene_name: str, flags: List[str]) -> Optional[str]:
+        """Returns the absolute path of the video Manim wrote for scene_name, or None."""
+        # Manim convention: media/videos/<script_stem>/<quality_dir>/<scene_name>.mp4
+        videos_dir = os.path.join('.', "media", "videos", script_stem)
+        video_name = f"{scene_name}.mp4"
+        # Expected quality dir first (one stat); the directory name may carry
+        # a frame rate suffix (e.g. 480p15), so scan the subdirs if that misses.
+        # The path is shown to the user and cached, so make it independent of the cwd.
+        output_file = os.path.join(videos_dir, self._get_quality_directory(flags), video_name)
+        if os.path.exists(output_file):
+            return os.path.abspath(output_file)
+        try:
+            with os.scandir(videos_dir) as entries:
+                for entry in entries:
+                    candidate = os.path.join(entry.path, video_name)
+                    if entry.is_dir() and os.path.exists(candidate):
+                        return os.path.abspath(candidate)
+        except FileNotFoundError:
+            pass # No videos directory at all
+        return None
+
+    def _read_png(self, script_stem: str, scene_name: str) -> Optional[bytes]:
+        """Reads the preview PNG for scene_name, or returns None if it can't be read yet."""
+        output_file = self._find_png(script_stem, scene_name)
+        if output_file is None:
+            return None
+        try:
+            with open(output_file, 'rb') as png_file:
+                return png_file.read()
+        except OSError as e:
+            print(f"[Manim Thread Warning] Could not read {output_file} early: {e}")
+            return None
+
     def _run_manim_thread(self, 
                           script_path: str, 
                           scene_name: str, 
                           flags: List[str], 
                           output_format: Literal['png', 'mp4'], 
-                          callback: Callable[[bool, Union[bytes, str]], None]):
+                          callback: Callable[[bool, Union[bytes, str]], None],
+                          generation: Optional[int] = None):
         """The function executed in the background thread to run Manim.
         
-        Handles subprocess execution, result checking, and cleanup.
+        Handles subprocess execution, result checking, and cleanup. A run
+        whose generation is superseded before it starts never launches Manim;
+        one superseded while it works is terminated. Either way its result is
+        dropped, and its callbacks receive the newer run's result instead.
         """
         command = [
-            'python', '-m', 'manim', 
+            self._python, '-m', 'manim', 
             script_path, 
             scene_name
         ] + flags
@@ -138,80 +599,109 @@ class ManimInterface:
         print(f"Running Manim command: {' '.join(command)}")
         success = False
         result_data: Union[bytes, str] = "Unknown error during execution."
-        script_path_obj = pathlib.Path(script_path)
+        # Plain string ops: no Path object per render
+        script_name = os.path.basename(script_path)
+        script_stem = os.path.splitext(script_name)[0]
+        job_key = (scene_name, output_format)
+        early_png: Optional[bytes] = None # PNG delivered before Manim exited
+        posted = False
 
         try:
-            result = subprocess.run(
-                command, 
-                capture_output=True, 
-                text=True, 
-                check=False # We check returncode manually below
-            )
+            if not self._is_current(job_key, generation):
+                # Superseded while queued in the pool: don't start Manim at all.
+                # The finally block drops the result and releases the script.
+                print(f"Skipping superseded render for {script_name}")
+                return
+
+            # Send Manim's output to real temp files rather than pipes: verbose
+            # progress output can't stall the child on a full pipe buffer, and
+            # nothing is read into Python unless the render fails.
+            # PNG previews are the exception for stdout: it is piped so the image
+            # can be picked up as soon as Manim logs "File ready at", overlapping
+            # Manim's shutdown with the UI update. Only a bounded tail of the
+            # piped output is kept for the failure message.
+            stream_png = output_format == 'png'
+            stdout_tail = bytearray()
+            stdout_file = contextlib.nullcontext() if stream_png else tempfile.TemporaryFile()
+            with stdout_file as out_f, tempfile.TemporaryFile() as err_f:
+                process = subprocess.Popen(command,
+                                           stdout=subprocess.PIPE if stream_png else out_f,
+                                           stderr=err_f)
+                with self._in_flight_lock:
+                    if generation is None or self._generations.get(job_key) == generation:
+                        self._in_flight[job_key] = process
+                    else:
+                        process.terminate() # Superseded between the check above and Popen
+                try:
+                    if stream_png:
+                        for line in process.stdout: # Read to EOF so the pipe never fills
+                            stdout_tail += line
+                            if len(stdout_tail) > 2 * self.ERROR_TAIL_BYTES:
+                                del stdout_tail[:-self.ERROR_TAIL_BYTES] # Trim in amortized O(1)
+                            if early_png is None and b"File ready at" in line:
+                                early_png = self._read_png(script_stem, scene_name)
+                                callbacks = None if early_png is None else self._claim_callbacks(job_key, generation, callback)
+                                if callbacks is not None:
+                                    for cb in callbacks:
+                                        self._post_result(cb, True, early_png)
+                                    posted = True
+                                    print(f"Preview PNG delivered before Manim exited for {script_name}")
+                    returncode = process.wait() # We check returncode manually below
+                finally:
+                    with self._in_flight_lock:
+                        if self._in_flight.get(job_key) is process:
+                            del self._in_flight[job_key]
+                if returncode != 0:
+                    if stream_png:
+                        stdout_text = stdout_tail[-self.ERROR_TAIL_BYTES:].decode('utf-8', errors='replace')
+                    else:
+                        stdout_text = self._read_tail(out_f)
+                    stderr_text = self._read_tail(err_f)
             
-            if result.returncode == 0:
+            if early_png is not None:
+                # The image was complete when Manim announced it; a failure while
+                # tearing down afterwards does not invalidate it
+                if returncode != 0:
+                    print(f"[Manim Thread Warning] Manim exited with code {returncode} after writing the preview PNG")
+                success = True
+                result_data = early_png
+
+            elif returncode == 0:
                 print(f"Manim execution successful (code 0) for {script_path}")
                 # --- Handle successful PNG output --- 
                 if output_format == 'png':
-                    script_stem = script_path_obj.stem
-                    # Manim convention: media/images/<script_stem>/<scene_name>*.png
-                    # Glob for the potentially timestamped file name
-                    # Assuming execution from project root where 'media' would be
-                    glob_pattern = f"media/images/{script_stem}/{scene_name}*.png"
+                    images_dir = os.path.join('.', 'media', 'images', script_stem)
                     try:
-                        output_files = list(pathlib.Path('.').glob(glob_pattern))
-                        if not output_files:
-                            result_data = f"Render success (code 0), but output PNG not found using glob: {glob_pattern}"
+                        output_file = self._find_png(script_stem, scene_name)
+                        if output_file is None:
+                            result_data = f"Render success (code 0), but output PNG for '{scene_name}' not found in {images_dir}"
                             print(f"[Manim Thread Warning] {result_data}")
-                        elif len(output_files) > 1:
-                            # Warn but proceed with the first file found
-                            result_data = f"Render success (code 0), but multiple PNGs found ({len(output_files)}) using glob: {glob_pattern}. Using first one." 
-                            print(f"[Manim Thread Warning] {result_data}")
-                            output_file = output_files[0]
-                            result_data = output_file.read_bytes()
-                            success = True
-                        else: # Exactly one file found
-                            output_file = output_files[0]
+                        else:
                             print(f"Found output PNG: {output_file}")
-                            result_data = output_file.read_bytes()
-                            success = True 
+                            with open(output_file, 'rb') as png_file:
+                                result_data = png_file.read()
+                            success = True
                     except Exception as e:
                         result_data = f"Render success (code 0), but failed to find/read output PNG: {e}"
                         print(f"[Manim Thread Error] {result_data}")
                         
                 # --- Handle successful MP4 output --- 
                 elif output_format == 'mp4':
-                    script_stem = script_path_obj.stem
-                    scene_name_no_ext = scene_name # Scene name usually doesn't have extension
-                    # quality_dir = self._get_quality_directory(flags) # Old way
-                    
-                    # Manim convention: media/videos/<script_stem>/<quality_dir_with_fps>/<scene_name>.mp4
-                    # Instead of predicting exact quality_dir, glob for the MP4 file.
-                    media_videos_script_dir = pathlib.Path('.') / "media" / "videos" / script_stem
-                    
-                    print(f"Searching for MP4 output for scene '{scene_name_no_ext}' in subdirectories of: {media_videos_script_dir}")
-                    
-                    # Glob pattern: */SceneName.mp4 (any subdir under media_videos_script_dir)
-                    found_files = list(media_videos_script_dir.glob(f"*/{scene_name_no_ext}.mp4"))
-                    
-                    if found_files:
-                        if len(found_files) > 1:
-                            # This case should be rare if Manim is run for a single quality setting at a time.
-                            print(f"[Manim Thread Warning] Multiple MP4s found for '{scene_name_no_ext}' in {media_videos_script_dir}. Using first: {found_files[0]}")
-                        
-                        output_file_path = str(found_files[0].resolve()) # Use absolute path
+                    videos_dir = os.path.join('.', "media", "videos", script_stem)
+                    output_file_path = self._find_mp4(script_stem, scene_name, flags)
+                    if output_file_path is not None:
                         print(f"Found output MP4: {output_file_path}")
                         success = True
                         result_data = output_file_path
                     else:
-                        # File not found using glob
-                        result_data = f"Render success (code 0), but output MP4 for '{scene_name_no_ext}' not found in any subdirectory of {media_videos_script_dir}"
+                        result_data = f"Render success (code 0), but output MP4 for '{scene_name}' not found in any subdirectory of {videos_dir}"
                         print(f"[Manim Thread Warning] {result_data}")
                         # success remains False
                     
             else: # Manim returned non-zero exit code
-                error_intro = f"Manim failed (code {result.returncode}) for {script_path}:"
+                error_intro = f"Manim failed (code {returncode}) for {script_path}:"
                 # Combine stdout/stderr for more context, prioritizing stderr
-                error_details = f"\n--- STDERR ---\n{result.stderr or '[No Stderr]'}\n--- STDOUT ---\n{result.stdout or '[No Stdout]'}"
+                error_details = f"\n--- STDERR ---\n{stderr_text or '[No Stderr]'}\n--- STDOUT ---\n{stdout_text or '[No Stdout]'}"
                 result_data = f"{error_intro}{error_details}"
                 print(f"[Manim Thread Error] {error_intro}")
                 # success remains False (set initially)
@@ -223,23 +713,38 @@ class ManimInterface:
             success = False # Ensure success is false if exception occurs
             
         finally:
+            # --- Cache successful results of content-addressed scripts ---
+            if success and self._is_cached_script(script_path):
+                cache_key = (script_stem, scene_name, tuple(flags), output_format)
+                self._store_result(cache_key, result_data)
+
             # --- Schedule Callback --- 
-            try:
-                self.root_app.schedule_task(callback, success, result_data)
-                print(f"Callback scheduled for {script_path_obj.name} (Success: {success})")
-            except Exception as cb_e:
-                print(f"[Manim Thread Error] Failed to schedule callback for {script_path_obj.name}: {cb_e}")
+            callbacks = None if posted else self._claim_callbacks(job_key, generation, callback)
+            if posted:
+                pass # Already delivered while Manim was shutting down
+            elif callbacks is None:
+                print(f"Dropping result of superseded render for {script_name}")
+            else:
+                try:
+                    for cb in callbacks:
+                        self._post_result(cb, success, result_data)
+                    print(f"Callback scheduled for {script_name} (Success: {success})")
+                except Exception as cb_e:
+                    print(f"[Manim Thread Error] Failed to schedule callback for {script_name}: {cb_e}")
 
             # --- Cleanup --- 
-            print(f"Cleaning up script: {script_path}") 
-            try:
-                # Use os.path.exists with the string path
-                if os.path.exists(script_path):
-                     os.remove(script_path)
-                     print(f"Successfully removed script: {script_path_obj.name}")
-                else:
-                     print(f"Script file not found for cleanup: {script_path}")
-            except OSError as e:
-                print(f"[Manim Thread Error] Failed to remove script {script_path}: {e}")
+            # Content-addressed scripts are kept for reuse (bounded by _prune_script_cache);
+            # releasing the hold makes this one eligible for pruning again
+            self._release_script(script_path)
+            if not self._is_cached_script(script_path):
+                print(f"Cleaning up script: {script_path}") 
+                try:
+                    # Unlink directly: one syscall, and no exists/remove race
+                    os.unlink(script_path)
+                    print(f"Successfully removed script: {script_name}")
+                except FileNotFoundError:
+                    print(f"Script file not found for cleanup: {script_path}")
+                except OSError as e:
+                    print(f"[Manim Thread Error] Failed to remove script {script_path}: {e}")
 
     # Note: Removed the extra pass from the end of the class definition 
\ No newline at end of file
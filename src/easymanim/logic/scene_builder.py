@@ -1,6 +1,5 @@
-import uuid
-import textwrap
-from typing import Any, Dict, List, Optional, Literal
+import itertools
+from typing import Any, Dict, List, Optional, Literal, Tuple
 
 # Default properties based on PRD and Manim standards
 DEFAULT_CIRCLE_PROPS = {
@@ -49,6 +48,26 @@ DEFAULT_PROPS_MAP = {
     'Text': DEFAULT_TEXT_PROPS, # PRD uses TextMobject, just use Text for type key
 }
 
+# Property keys update_object_property accepts, per object type
+ALLOWED_PROPS_MAP = {obj_type: frozenset(props) for obj_type, props in DEFAULT_PROPS_MAP.items()}
+
+# Properties stored as floats
+FLOAT_PROPS = frozenset({'radius', 'side_length', 'font_size', 'opacity', 'stroke_width', 'stroke_opacity'})
+
+# Object creation line emitted by generate_script, per object type. Fields are
+# property keys (values pre-formatted by _format_manim_prop) plus {var_name}.
+_MOVE_TO = ".move_to(np.array([{pos_x}, {pos_y}, {pos_z}]))"
+MANIM_TEMPLATE_MAP = {
+    'Circle': ("{var_name} = Circle(radius={radius}, fill_color={fill_color}, fill_opacity={opacity}, "
+               "stroke_color={stroke_color}, stroke_width={stroke_width}, stroke_opacity={stroke_opacity})" + _MOVE_TO),
+    'Square': ("{var_name} = Square(side_length={side_length}, fill_color={fill_color}, fill_opacity={opacity}, "
+               "stroke_color={stroke_color}, stroke_width={stroke_width}, stroke_opacity={stroke_opacity})" + _MOVE_TO),
+    # Manim's Text uses 'color' for fill, but also accepts 'fill_color'. Using 'color' for primary text color.
+    # stroke_width is deliberately omitted for Text for now as it behaves differently than shapes.
+    'Text': ("{var_name} = Text({text_content}, font_size={font_size}, color={fill_color}, fill_opacity={opacity}, "
+             "stroke_color={stroke_color}, stroke_opacity={stroke_opacity})" + _MOVE_TO),
+}
+
 class SceneBuilder:
     """Manages the state of the Manim scene being constructed.
 
@@ -56,19 +75,31 @@ class SceneBuilder:
     and generating Manim scripts.
     """
     def __init__(self):
-        """Initializes the SceneBuilder with an empty list of scene objects."""
-        self.objects: List[Dict[str, Any]] = []
+        """Initializes the SceneBuilder with an empty collection of scene objects."""
+        # id -> object dict, in insertion order; the single store behind self.objects
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._id_counter = itertools.count(1)
+        # Bumped by every mutator; a script cached at the current version is still valid
+        self._version = 0
+        # script_type -> (scene version, script content, scene name) of the last generation
+        self._script_cache: Dict[str, Tuple[int, str, str]] = {}
+
+    @property
+    def objects(self) -> List[Dict[str, Any]]:
+        """A new list of the object dictionaries, in the order they were added."""
+        return list(self._by_id.values())
 
     def _generate_unique_id(self, obj_type: str) -> str:
         """Generates a unique ID for a scene object."""
-        # Format: objecttype_first6charsofUUIDhex
-        return f"{obj_type.lower()}_{uuid.uuid4().hex[:6]}"
+        # Format: objecttype_6hexdigits. A per-builder counter is cheaper than
+        # uuid4 (no urandom call) and, unlike 6 chars of a uuid, never collides.
+        return f"{obj_type.lower()}_{next(self._id_counter):06x}"
 
     def add_object(self, obj_type: str) -> str:
         """Adds a new object of the specified type to the scene.
         
         Creates an object dictionary with default properties based on the type,
-        assigns a unique ID, and appends it to the internal list.
+        assigns a unique ID, and stores it under that ID.
 
         Args:
             obj_type: The type of Manim object to add (e.g., 'Circle', 'Square', 'Text').
@@ -90,30 +121,29 @@ class SceneBuilder:
             'id': new_id,
             'type': obj_type,
             'properties': default_props.copy(), # animation is now part of default_props
+            'var_name': f"{obj_type.lower()}_{new_id[-6:]}", # Script variable, fixed for the object's lifetime
             # 'animation': 'None' # No longer a top-level item here
         }
         
-        self.objects.append(new_object_data)
+        self._by_id[new_id] = new_object_data
+        self._version += 1
         
         return new_id
 
     def get_object_properties(self, obj_id: str) -> Optional[Dict[str, Any]]:
         """Retrieves the 'properties' sub-dictionary for a given object ID.
         This dictionary contains all displayable and editable attributes.
+        Edit it through update_object_property: in-place edits do not
+        invalidate generate_script's cached script.
         """
-        for obj in self.objects:
-            if obj.get('id') == obj_id:
-                # Return the 'properties' sub-dictionary directly
-                return obj.get('properties')
-        return None
+        obj = self._by_id.get(obj_id)
+        # Return the 'properties' sub-dictionary directly
+        return obj.get('properties') if obj is not None else None
 
     def update_object_property(self, obj_id: str, prop_key: str, value: Any, axis_index: Optional[int] = None):
         """Updates a specific property of a specific object within its 'properties' dict."""
-        obj_to_update = None
-        for obj_data in self.objects: # Renamed obj to obj_data to avoid conflict
-            if obj_data['id'] == obj_id:
-                obj_to_update = obj_data
-                break
+        obj_to_update = self._by_id.get(obj_id)
+        self._version += 1
 
         if obj_to_update:
             properties = obj_to_update['properties'] # Get the sub-dictionary
@@ -133,10 +163,13 @@ class SceneBuilder:
             elif prop_key == 'animation': # Handle animation directly now
                  properties[prop_key] = str(value) # Ensure it's a string
                  print(f"Updated property for {obj_id}: {prop_key} to {value}. Properties: {properties}")
+            elif prop_key not in ALLOWED_PROPS_MAP[obj_to_update['type']]:
+                # Objects keep exactly their type's default keys; never add new ones
+                print(f"Error: Unknown property '{prop_key}' for {obj_id}. Update ignored.")
             else:
                 # Default behavior for other properties
                 # Type conversion might be needed here based on prop_key
-                if prop_key in ['radius', 'side_length', 'font_size', 'opacity', 'stroke_width', 'stroke_opacity']:
+                if prop_key in FLOAT_PROPS:
                     try:
                         properties[prop_key] = float(value)
                     except ValueError:
@@ -147,18 +180,15 @@ class SceneBuilder:
                 elif prop_key == 'fill_color': # Assuming color is a hex string
                     properties[prop_key] = str(value)
                 else:
-                    properties[prop_key] = value # Fallback for other types or new properties
+                    properties[prop_key] = value # Fallback for other known properties
                 print(f"Updated property for {obj_id}: {prop_key} to {value}. Properties: {properties}")
         else:
             print(f"Error: Object with ID {obj_id} not found for update.")
 
     def set_object_animation(self, obj_id: str, anim_name: str):
         """Sets the animation type for a specific object within its 'properties' dict."""
-        target_object_data = None
-        for obj_data in self.objects:
-            if obj_data.get('id') == obj_id:
-                target_object_data = obj_data
-                break
+        target_object_data = self._by_id.get(obj_id)
+        self._version += 1
 
         if target_object_data is None:
             print(f"Error: Object with ID {obj_id} not found for setting animation.")
@@ -175,10 +205,10 @@ class SceneBuilder:
 
         Returns:
             A list containing dictionaries, where each dictionary represents
-            an object in the scene.
+            an object in the scene, in the order added.
         """
-        # Return a shallow copy to prevent external modification of internal list
-        return self.objects.copy() 
+        # Return a shallow copy to prevent external modification of internal state
+        return list(self._by_id.values())
 
     def _format_manim_prop(self, value: Any) -> str:
         """Formats a Python value into a Manim-compatible string representation."""
@@ -203,6 +233,12 @@ class SceneBuilder:
             - The generated Python script content as a string.
             - The name of the Manim Scene class defined in the script.
         """
+        # Repeat previews/renders of an unchanged scene reuse the last script:
+        # no mutator has run since it was made, so it is still up to date
+        cached = self._script_cache.get(script_type)
+        if cached is not None and cached[0] == self._version:
+            return cached[1], cached[2]
+
         object_creation_lines = []
         add_lines = []
         play_lines = [] # For render script later
@@ -215,55 +251,19 @@ class SceneBuilder:
         ]
         
         # Generate code for each object
-        for obj in self.objects:
-            obj_id = obj['id']
+        for obj in self._by_id.values():
             obj_type = obj['type']
             properties = obj['properties']
             animation = properties.get('animation', 'None') 
             
-            var_name = f"{obj_type.lower()}_{obj_id[-6:]}"
+            var_name = obj['var_name']
             
             # --- Object Instantiation (common for all) ---
-            prop_args_for_script = [] # Renamed to avoid conflict if you had prop_args locally
-            pos_x = properties.get('pos_x', 0.0)
-            pos_y = properties.get('pos_y', 0.0)
-            pos_z = properties.get('pos_z', 0.0)
-            move_to_str = f".move_to(np.array([{pos_x}, {pos_y}, {pos_z}]))"
-            
-            instantiation_base = f"{var_name} = {obj_type}("
-            if obj_type == 'Text':
-                text_content_formatted = self._format_manim_prop(properties.get('text_content', ''))
-                instantiation_base += text_content_formatted
-                font_size_val = properties.get('font_size')
-                if font_size_val is not None:
-                    prop_args_for_script.append(f"font_size={self._format_manim_prop(font_size_val)}")
-                # Manim's Text uses 'color' for fill, but also accepts 'fill_color'. Using 'color' for primary text color.
-                prop_args_for_script.append(f"color={self._format_manim_prop(properties.get('fill_color', '#FFFFFF'))}")
-                prop_args_for_script.append(f"fill_opacity={self._format_manim_prop(properties.get('opacity', 1.0))}")
-                prop_args_for_script.append(f"stroke_color={self._format_manim_prop(properties.get('stroke_color', '#000000'))}")
-                prop_args_for_script.append(f"stroke_opacity={self._format_manim_prop(properties.get('stroke_opacity', 1.0))}")
-                # stroke_width is deliberately omitted for Text for now as it behaves differently than shapes.
-            elif obj_type == 'Circle':
-                prop_args_for_script.append(f"radius={self._format_manim_prop(properties.get('radius', 1.0))}")
-                prop_args_for_script.append(f"fill_color={self._format_manim_prop(properties.get('fill_color', '#FFFFFF'))}")
-                prop_args_for_script.append(f"fill_opacity={self._format_manim_prop(properties.get('opacity', 1.0))}")
-                prop_args_for_script.append(f"stroke_color={self._format_manim_prop(properties.get('stroke_color', '#FFFFFF'))}")
-                prop_args_for_script.append(f"stroke_width={self._format_manim_prop(properties.get('stroke_width', 2.0))}")
-                prop_args_for_script.append(f"stroke_opacity={self._format_manim_prop(properties.get('stroke_opacity', 1.0))}")
-            elif obj_type == 'Square':
-                prop_args_for_script.append(f"side_length={self._format_manim_prop(properties.get('side_length', 2.0))}")
-                prop_args_for_script.append(f"fill_color={self._format_manim_prop(properties.get('fill_color', '#FFFFFF'))}")
-                prop_args_for_script.append(f"fill_opacity={self._format_manim_prop(properties.get('opacity', 1.0))}")
-                prop_args_for_script.append(f"stroke_color={self._format_manim_prop(properties.get('stroke_color', '#FFFFFF'))}")
-                prop_args_for_script.append(f"stroke_width={self._format_manim_prop(properties.get('stroke_width', 2.0))}")
-                prop_args_for_script.append(f"stroke_opacity={self._format_manim_prop(properties.get('stroke_opacity', 1.0))}")
-
-            if prop_args_for_script:
-                if obj_type == 'Text' and instantiation_base.endswith(text_content_formatted):
-                    instantiation_base += ", "
-                instantiation_base += ", ".join(prop_args_for_script)
-            final_instantiation = f"{instantiation_base}){move_to_str}"
-            object_creation_lines.append(final_instantiation)
+            # One format_map over the type's template; objects always hold every
+            # template key (they start from the defaults and never lose keys)
+            template_fields = {key: self._format_manim_prop(value) for key, value in properties.items()}
+            template_fields['var_name'] = var_name
+            object_creation_lines.append(MANIM_TEMPLATE_MAP[obj_type].format_map(template_fields))
             
             # --- Animation and Scene Addition Logic ---
             added_by_intro_animation = False
@@ -313,11 +313,12 @@ class SceneBuilder:
             construct_body_lines.extend(add_lines)
             
         if not (object_creation_lines or add_lines or play_lines): # Check if any content for body
-            indented_body = "        pass # No objects or animations"
-        else:
-            indented_body = textwrap.indent("\n".join(construct_body_lines), "        ")
+            construct_body_lines = ["pass # No objects or animations"]
 
-        script_lines = imports + ["", class_def, construct_def, indented_body]
+        # Indent while assembling, so the whole script is built by a single join
+        script_lines = imports + ["", class_def, construct_def]
+        script_lines.extend("        " + line for line in construct_body_lines)
         script_content = "\n".join(script_lines)
 
+        self._script_cache[script_type] = (self._version, script_content, scene_name)
         return script_content, scene_name 
\ No newline at end of file
@@ -100,7 +100,10 @@ class MainApplication(ttk.Window):
     def run(self):
         """Start the Tkinter main event loop."""
         print("Starting main application loop...")
-        self.mainloop()
+        try:
+            self.mainloop()
+        finally:
+            self.manim_interface.close() # Remove the script temp dir
 
 # Entry point will be in a separate main.py or handled by packaging
 # if __name__ == "__main__":
@@ -0,0 +1,79 @@
+import pytest
+import tkinter as tk
+import ttkbootstrap as ttk
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from easymanim.ui.ui_manager import UIManager
+from easymanim.gui.toolbar_panel import ToolbarPanel
+
+# One Tk interpreter (and one ttkbootstrap theme load) for the whole GUI test session.
+# Creating a fresh ttk.Window() per test dominates the runtime of these widget tests.
+@pytest.fixture(scope="session")
+def _ttk_style():
+    root = ttk.Window()
+    root.withdraw() # Hide the main window during tests
+    yield root
+    root.destroy()
+
+@pytest.fixture
+def root(_ttk_style):
+    """A throwaway Toplevel per test; destroying it tears down everything the test built."""
+    top = tk.Toplevel(_ttk_style)
+    top.withdraw()
+    yield top
+    top.destroy()
+
+@pytest.fixture(scope="session")
+def _ui_manager_mock():
+    return Mock(spec=UIManager)
+
+@pytest.fixture
+def mock_ui_manager(_ui_manager_mock):
+    """A spec'd UIManager mock built once per session and reset after each test."""
+    yield _ui_manager_mock
+    _ui_manager_mock.reset_mock()
+
+class FakeWidget:
+    """Tk-free stand-in for a ttk widget: records its options, layout calls are no-ops."""
+
+    def __init__(self, parent=None, **options):
+        self.parent = parent
+        self.options = options
+
+    def pack(self, **kwargs):
+        pass
+
+    def cget(self, key):
+        return self.options.get(key)
+
+class FakeButton(FakeWidget):
+    """Tk-free ttk.Button: invoke() runs the command synchronously like the real one."""
+
+    def invoke(self):
+        command = self.options.get('command')
+        return command() if command else None
+
+class _NoTkFrame(ttk.Frame):
+    """Sits between ToolbarPanel and ttk.Frame in the MRO, so super().__init__ creates no widget."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+class TklessToolbarPanel(ToolbarPanel, _NoTkFrame):
+    """ToolbarPanel that skips the Tk Frame; other Frames in the process are untouched."""
+
+@pytest.fixture
+def fake_tk(monkeypatch):
+    """Build ToolbarPanels on fake widgets, without a Tk root.
+
+    Only the toolbar module's own `ttk` name is replaced, and the Frame base is
+    skipped by a test-only subclass, so nothing shared with other widgets is
+    patched.
+
+    Returns:
+        The Tk-free ToolbarPanel subclass to instantiate.
+    """
+    from easymanim.gui import toolbar_panel
+    monkeypatch.setattr(toolbar_panel, 'ttk', SimpleNamespace(Button=FakeButton, Separator=FakeWidget))
+    return TklessToolbarPanel
@@ -5,24 +5,49 @@ from unittest.mock import Mock
 
 # Assuming PropertiesPanel will be in src/easymanim/gui/properties_panel.py
 from easymanim.gui.properties_panel import PropertiesPanel
+from easymanim.gui import properties_panel as pp_module
+
+# Keep this file on one xdist worker (one Tcl interpreter); see CONTRIBUTING.md
+pytestmark = pytest.mark.xdist_group(name="gui_props")
+
+# Sample Circle properties shared by the tests; override keys per test as needed
+_CIRCLE_PROPS_BASE = {
+    'type': 'Circle', 'position': (0, 0, 0), 'radius': 1,
+    'color': '#FFF', 'opacity': 1.0, 'animation': 'None'
+}
+_CIRCLE_PROPS_FADEIN = {
+    **_CIRCLE_PROPS_BASE,
+    'position': (1.0, -0.5, 0.0), 'radius': 0.75,
+    'color': '#FF0000', # Red
+    'opacity': 0.8, 'animation': 'FadeIn'
+}
+
+_POPULATED_ID = "circle_abc"
+
+@pytest.fixture(scope="module")
+def populated_panel(_ttk_style, _ui_manager_mock):
+    """A PropertiesPanel showing _CIRCLE_PROPS_FADEIN, built once for the module."""
+    panel = PropertiesPanel(_ttk_style, _ui_manager_mock)
+    panel.pack(fill=tk.BOTH, expand=True)
+    panel.display_properties(_POPULATED_ID, _CIRCLE_PROPS_FADEIN)
+    yield panel
+    panel.destroy()
+
+@pytest.fixture
+def circle_panel(populated_panel, mock_ui_manager):
+    """The shared populated panel; entries a test edits are restored afterwards."""
+    yield populated_panel
+    radius_entry = populated_panel.widgets['radius']
+    radius_entry.delete(0, tk.END)
+    radius_entry.insert(0, str(_CIRCLE_PROPS_FADEIN['radius']))
+    populated_panel.widgets['animation'].set(_CIRCLE_PROPS_FADEIN['animation'])
 
-# Fixture to create a root window for tests needing GUI elements
-@pytest.fixture(scope="function")
-def root():
-    # Use ttkbootstrap Window instead of tk.Tk
-    root = ttk.Window()
-    root.withdraw() # Hide the main window during tests
-    yield root
-    root.destroy()
-
-def test_properties_panel_init_shows_placeholder(root, mocker):
+def test_properties_panel_init_shows_placeholder(root, mock_ui_manager):
     """Test that the PropertiesPanel shows placeholder text on initialization."""
-    mock_ui_manager = mocker.Mock()
 
     # Create the panel instance
     properties_panel = PropertiesPanel(root, mock_ui_manager)
     properties_panel.pack(fill=tk.BOTH, expand=True)
-    root.update_idletasks()
 
     # Find the placeholder label - assuming it's the only widget initially
     children = properties_panel.winfo_children()
@@ -35,27 +60,12 @@ def test_properties_panel_init_shows_placeholder(root, mocker):
     actual_text = placeholder_label.cget("text")
     assert actual_text == expected_text, f"Expected placeholder text '{expected_text}', but got '{actual_text}'"
 
-def test_properties_panel_display_properties_shows_widgets(root, mocker):
+def test_properties_panel_display_properties_shows_widgets(circle_panel):
     """Test display_properties creates the correct widgets for a Circle."""
-    mock_ui_manager = mocker.Mock()
-    properties_panel = PropertiesPanel(root, mock_ui_manager)
-    properties_panel.pack(fill=tk.BOTH, expand=True)
-    root.update_idletasks()
-
-    test_id = "circle_abc"
-    # Sample properties for a Circle object
-    test_props = {
-        'type': 'Circle',
-        'position': (1.0, -0.5, 0.0),
-        'radius': 0.75,
-        'color': '#FF0000', # Red
-        'opacity': 0.8,
-        'animation': 'FadeIn'
-    }
-
-    # Call the method to display properties
-    properties_panel.display_properties(test_id, test_props)
-    root.update_idletasks()
+    # circle_panel has already displayed these properties
+    properties_panel = circle_panel
+    test_props = _CIRCLE_PROPS_FADEIN
+    assert properties_panel.current_object_id == _POPULATED_ID
 
     # Assert placeholder is gone
     assert properties_panel._placeholder_label is None, "Placeholder should be removed"
@@ -70,49 +80,29 @@ def test_properties_panel_display_properties_shows_widgets(root, mocker):
     assert actual_children_count == expected_widget_count, \
         f"Expected exactly {expected_widget_count} direct child widgets, found {actual_children_count}"
 
-    # Check specific widget types and initial values (more detailed checks needed)
-    # Example: Find the Radius Entry
-    radius_entry = None
-    for widget in properties_panel.winfo_children():
-        if isinstance(widget, ttk.Entry) and hasattr(widget, "_property_key") and widget._property_key == "radius":
-             radius_entry = widget
-             break
-    # assert radius_entry is not None, "Radius Entry widget not found"
-    # assert radius_entry.get() == str(test_props['radius'])
-
-    # Example: Find the Animation Combobox
-    anim_combo = None
-    for widget in properties_panel.winfo_children():
-         if isinstance(widget, ttk.Combobox) and hasattr(widget, "_property_key") and widget._property_key == "animation":
-             anim_combo = widget
-             break
-    # assert anim_combo is not None, "Animation Combobox widget not found"
-    # assert anim_combo.get() == str(test_props['animation'])
+    # Check specific widget types and initial values via the panel's widget dict
+    radius_entry = properties_panel.widgets.get('radius')
+    assert radius_entry is not None, "Radius Entry widget not found"
+    assert radius_entry.get() == str(test_props['radius'])
+
+    anim_combo = properties_panel.widgets.get('animation')
+    assert anim_combo is not None, "Animation Combobox widget not found"
+    assert anim_combo.get() == str(test_props['animation'])
 
     # TODO: Add more detailed checks for other widgets (Position X/Y/Z, Color Button, Opacity)
     # This requires the implementation to store references or assign unique names/tags.
     # For now, just check the count as a basic verification.
     print(f"Found {actual_children_count} children widgets after display_properties.") # Debug
 
-def test_properties_panel_show_placeholder_clears_widgets(root, mocker):
+def test_properties_panel_show_placeholder_clears_widgets(root, mock_ui_manager):
     """Test that show_placeholder removes property widgets and shows the label."""
-    mock_ui_manager = mocker.Mock()
     properties_panel = PropertiesPanel(root, mock_ui_manager)
     properties_panel.pack(fill=tk.BOTH, expand=True)
-    root.update_idletasks()
 
     # Display some properties first
     test_id = "circle_abc"
-    test_props = {
-        'type': 'Circle',
-        'position': (1.0, -0.5, 0.0),
-        'radius': 0.75,
-        'color': '#FF0000',
-        'opacity': 0.8,
-        'animation': 'FadeIn'
-    }
+    test_props = _CIRCLE_PROPS_FADEIN
     properties_panel.display_properties(test_id, test_props)
-    root.update_idletasks()
 
     # Verify widgets were added
     assert len(properties_panel.winfo_children()) > 1, "Widgets should have been added by display_properties"
@@ -120,7 +110,6 @@ def test_properties_panel_show_placeholder_clears_widgets(root, mocker):
 
     # Now, call show_placeholder
     properties_panel.show_placeholder()
-    root.update_idletasks()
 
     # Verify only the placeholder label remains
     children = properties_panel.winfo_children()
@@ -137,21 +126,10 @@ def test_properties_panel_show_placeholder_clears_widgets(root, mocker):
     # Verify internal widget dict is cleared
     assert not properties_panel.widgets, "Internal widget dictionary should be empty after show_placeholder"
 
-def test_properties_panel_entry_validation_and_update(root, mocker):
+def test_properties_panel_entry_validation_and_update(circle_panel, mock_ui_manager):
     """Test Entry field validation and update via UIManager."""
-    mock_ui_manager = mocker.Mock()
-    properties_panel = PropertiesPanel(root, mock_ui_manager)
-    properties_panel.pack(fill=tk.BOTH, expand=True)
-    root.update_idletasks()
-
-    # Display properties for a circle
-    test_id = "circle_val"
-    test_props = {
-        'type': 'Circle', 'radius': 0.75, 'position': (0,0,0), 
-        'color': '#FFF', 'opacity': 1.0, 'animation': 'None'
-    }
-    properties_panel.display_properties(test_id, test_props)
-    root.update_idletasks()
+    properties_panel = circle_panel
+    test_id = _POPULATED_ID
 
     # Find the radius entry widget (assuming it's stored in self.widgets['radius'])
     assert 'radius' in properties_panel.widgets, "Radius widget not found in internal dict"
@@ -166,15 +144,17 @@ def test_properties_panel_entry_validation_and_update(root, mocker):
     
     # --- Test Update on FocusOut/Return ---
     new_radius_value = "1.25"
+    handler = mock_ui_manager.handle_property_change
     radius_entry.delete(0, tk.END)
     radius_entry.insert(0, new_radius_value)
 
-    # Simulate FocusOut event (requires binding to be implemented)
-    radius_entry.event_generate("<FocusOut>")
-    root.update()
+    # Call the FocusOut handler directly instead of pumping the Tk event loop;
+    # no event object is needed, the panel resolves the entry by key
+    properties_panel._on_focus_out_handlers['radius'](None)
 
     # Assert the UIManager was called correctly once
-    mock_ui_manager.handle_property_change.assert_called_once_with(test_id, 'radius', float(new_radius_value))
+    assert handler.call_count == 1
+    assert handler.call_args == ((test_id, 'radius', float(new_radius_value)), {})
 
     # # Simulate Return key press (requires binding to be implemented)
     # new_radius_value_2 = "0.5"
@@ -196,27 +176,21 @@ def test_properties_panel_entry_validation_and_update(root, mocker):
     # ]
     # mock_ui_manager.handle_property_change.assert_has_calls(expected_calls)
 
-def test_properties_panel_color_button_updates(root, mocker):
+def test_properties_panel_color_button_updates(root, mock_ui_manager, mocker):
     """Test the color picker button updates UIManager and swatch."""
-    mock_ui_manager = mocker.Mock()
     # Mock the askcolor dialog where it is used
     new_color_hex = "#0000ff" # Blue
     new_color_rgb = (0, 0, 255)
-    mock_askcolor = mocker.patch('easymanim.gui.properties_panel.askcolor', return_value=(new_color_rgb, new_color_hex))
+    mock_askcolor = mocker.patch.object(pp_module, 'askcolor', new=Mock(return_value=(new_color_rgb, new_color_hex)))
     
     properties_panel = PropertiesPanel(root, mock_ui_manager)
     properties_panel.pack(fill=tk.BOTH, expand=True)
-    root.update_idletasks()
 
     # Display properties including a color
     test_id = "circle_color"
     initial_color = "#ff0000" # Red
-    test_props = {
-        'type': 'Circle', 'radius': 1, 'position': (0,0,0), 
-        'color': initial_color, 'opacity': 1.0, 'animation': 'None'
-    }
+    test_props = {**_CIRCLE_PROPS_BASE, 'color': initial_color}
     properties_panel.display_properties(test_id, test_props)
-    root.update_idletasks()
 
     # Find the button and swatch (assuming they are stored in self.widgets)
     assert 'color' in properties_panel.widgets, "Color button widget not found in internal dict"
@@ -230,56 +204,42 @@ def test_properties_panel_color_button_updates(root, mocker):
     assert str(color_swatch.cget("background")) == initial_color
 
     # Simulate button click (requires command binding)
-    color_button.invoke()
-    root.update()
+    handler = mock_ui_manager.handle_property_change
+    color_button.invoke() # Command runs synchronously, no event loop pump needed
 
     # Assert askcolor was called
     mock_askcolor.assert_called_once()
 
     # Assert UIManager was called with the new color
-    mock_ui_manager.handle_property_change.assert_called_once_with(test_id, 'color', new_color_hex)
+    assert handler.call_count == 1
+    assert handler.call_args == ((test_id, 'color', new_color_hex), {})
 
     # Assert swatch background was updated
     assert str(color_swatch.cget("background")) == new_color_hex
 
-def test_properties_panel_animation_select_updates(root, mocker):
-    """Test updating the animation entry calls ui_manager.handle_property_change (TEMP)."""
-    mock_ui_manager = mocker.Mock()
-    properties_panel = PropertiesPanel(root, mock_ui_manager)
-    properties_panel.pack(fill=tk.BOTH, expand=True)
-    root.update_idletasks()
-
-    # Display properties including animation
-    test_id = "circle_anim"
-    initial_animation = "None"
-    test_props = {
-        'type': 'Circle', 'radius': 1, 'position': (0,0,0), 
-        'color': '#FFF', 'opacity': 1.0, 'animation': initial_animation
-    }
-    properties_panel.display_properties(test_id, test_props)
-    root.update_idletasks()
+def test_properties_panel_animation_select_updates(circle_panel, mock_ui_manager):
+    """Test selecting an animation calls ui_manager.handle_animation_change."""
+    properties_panel = circle_panel
+    test_id = _POPULATED_ID
+    initial_animation = _CIRCLE_PROPS_FADEIN['animation']
 
-    # Find the animation entry (assuming it's stored in self.widgets['animation'])
+    # Find the animation combobox (assuming it's stored in self.widgets['animation'])
     assert 'animation' in properties_panel.widgets, "Animation widget not found in internal dict"
-    anim_entry = properties_panel.widgets['animation']
-    # assert isinstance(anim_combo, ttk.Combobox), "Animation widget is not a Combobox"
-    assert isinstance(anim_entry, ttk.Entry), "Animation widget is not an Entry (TEMP)"
+    anim_combo = properties_panel.widgets['animation']
+    assert isinstance(anim_combo, ttk.Combobox), "Animation widget is not a Combobox"
 
     # Verify initial value
-    # assert anim_combo.get() == initial_animation
-    assert anim_entry.get() == initial_animation
+    assert anim_combo.get() == initial_animation
 
-    # Simulate changing the value in the entry
+    # Simulate a selection and call the handler directly (no event loop pump)
     new_animation = "GrowFromCenter"
-    anim_entry.delete(0, tk.END)
-    anim_entry.insert(0, new_animation)
-    
-    # Simulate FocusOut event
-    anim_entry.event_generate("<FocusOut>")
-    root.update() # Process events
-
-    # Assert UIManager was called with the new animation value via handle_property_change
-    # mock_ui_manager.handle_animation_change.assert_called_once_with(test_id, new_animation)
-    mock_ui_manager.handle_property_change.assert_called_once_with(test_id, 'animation', new_animation)
+    handler = mock_ui_manager.handle_animation_change
+    anim_combo.set(new_animation)
+    properties_panel._on_animation_selected(Mock(widget=anim_combo), 'animation')
+
+    # Assert UIManager was called with the new animation value
+    assert handler.call_count == 1
+    assert handler.call_args == ((test_id, new_animation), {})
+    mock_ui_manager.handle_property_change.assert_not_called()
 
 # Placeholder for further property tests if needed (e.g., position updates) 
\ No newline at end of file
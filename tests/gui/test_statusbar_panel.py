@@ -6,17 +6,11 @@ from unittest.mock import Mock
 # Assuming StatusBarPanel will be in src/easymanim/gui/statusbar_panel.py
 from easymanim.gui.statusbar_panel import StatusBarPanel
 
-# Fixture to create a root window for tests needing GUI elements
-@pytest.fixture(scope="function") # Function scope for isolation
-def root():
-    root = tk.Tk()
-    root.withdraw() # Hide the main window during tests
-    yield root
-    root.destroy()
-
-def test_statusbar_panel_set_status(root, mocker):
+# Keep this file on one xdist worker (one Tcl interpreter); see CONTRIBUTING.md
+pytestmark = pytest.mark.xdist_group(name="gui_statusbar")
+
+def test_statusbar_panel_set_status(root, mock_ui_manager):
     """Test the initial status and the set_status method."""
-    mock_ui_manager = mocker.Mock() # Not really needed, but pass for consistency
 
     # Create the panel instance
     statusbar_panel = StatusBarPanel(root, mock_ui_manager)
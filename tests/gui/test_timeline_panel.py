@@ -6,17 +6,11 @@ from unittest.mock import Mock
 # Assuming TimelinePanel will be in src/easymanim/gui/timeline_panel.py
 from easymanim.gui.timeline_panel import TimelinePanel
 
-# Fixture to create a root window for tests needing GUI elements
-@pytest.fixture(scope="module")
-def root():
-    root = tk.Tk()
-    root.withdraw() # Hide the main window during tests
-    yield root
-    root.destroy()
-
-def test_timeline_panel_init_shows_placeholder(root, mocker):
+# Keep this file on one xdist worker (one Tcl interpreter); see CONTRIBUTING.md
+pytestmark = pytest.mark.xdist_group(name="gui_timeline")
+
+def test_timeline_panel_init_shows_placeholder(root, mock_ui_manager):
     """Test that the TimelinePanel shows placeholder text on initialization."""
-    mock_ui_manager = mocker.Mock()
 
     # Create the panel instance
     timeline_panel = TimelinePanel(root, mock_ui_manager)
@@ -55,9 +49,8 @@ def test_timeline_panel_init_shows_placeholder(root, mocker):
     assert placeholder_text == expected_text, f"Expected placeholder text '{expected_text}', but got '{placeholder_text}'"
 
 # Placeholder for future tests
-def test_timeline_panel_add_block_creates_items(root, mocker):
+def test_timeline_panel_add_block_creates_items(root, mock_ui_manager):
     """Test that add_block adds rectangle and text items to the canvas."""
-    mock_ui_manager = mocker.Mock()
     timeline_panel = TimelinePanel(root, mock_ui_manager)
     timeline_panel.pack(fill=tk.BOTH, expand=True)
     root.update_idletasks()
@@ -71,30 +64,15 @@ def test_timeline_panel_add_block_creates_items(root, mocker):
     # Call add_block
     test_id = "circle_abc"
     test_type = "Circle"
-    timeline_panel.add_block(obj_id=test_id, obj_type=test_type)
-    root.update_idletasks() # Ensure drawing updates
+    # add_block draws synchronously and returns the new item IDs; no event pump needed
+    rect_item_id, text_item_id = timeline_panel.add_block(obj_id=test_id, obj_type=test_type)
 
     # Assert placeholder is gone
     assert not canvas.find_withtag("placeholder_text"), "Placeholder should be removed after adding a block"
 
-    # Assert block items exist (assuming a common tag 'timeline_block' and specific id tag)
-    block_items = canvas.find_withtag(f"obj_{test_id}")
-    assert len(block_items) >= 2, f"Expected at least 2 items (rect, text) for obj_{test_id}, found {len(block_items)}"
-
-    # Find the text item specifically (might need a more specific tag or check item type)
-    text_item_id = None
-    rect_item_id = None
-    for item_id in block_items:
-        try: # Check item type safely
-            if canvas.type(item_id) == "text":
-                text_item_id = item_id
-            elif canvas.type(item_id) == "rectangle":
-                rect_item_id = item_id
-        except tk.TclError: # Item might have been deleted?
-            pass 
-            
-    assert text_item_id is not None, "Text item for the block not found"
-    assert rect_item_id is not None, "Rectangle item for the block not found"
+    # Assert block items exist and carry the object tag
+    assert f"obj_{test_id}" in canvas.gettags(rect_item_id), "Rectangle item missing the object tag"
+    assert f"obj_{test_id}" in canvas.gettags(text_item_id), "Text item missing the object tag"
 
     # Check text content
     block_text = canvas.itemcget(text_item_id, "text")
@@ -107,31 +85,16 @@ def test_timeline_panel_add_block_creates_items(root, mocker):
     assert rect_item_id in timeline_panel.object_canvas_items, "Rectangle ID not found in internal mapping"
     assert timeline_panel.object_canvas_items[rect_item_id] == test_id, "Internal mapping does not point to the correct object ID"
 
-def test_timeline_panel_click_block_selects(root, mocker):
+def test_timeline_panel_click_block_selects(root, mock_ui_manager, mocker):
     """Test clicking a block calls ui_manager.handle_timeline_selection with the object ID."""
-    mock_ui_manager = mocker.Mock()
     timeline_panel = TimelinePanel(root, mock_ui_manager)
     timeline_panel.pack(fill=tk.BOTH, expand=True)
     root.update_idletasks()
     canvas = timeline_panel.canvas
-    timeline_panel._draw_placeholder_text() # Ensure placeholder drawn initially if needed
 
     # Add a block
     test_id = "circle_xyz"
-    timeline_panel.add_block(obj_id=test_id, obj_type="Circle")
-    root.update_idletasks()
-
-    # Find the rectangle ID for the added block
-    rect_item_id = None
-    block_items = canvas.find_withtag(f"obj_{test_id}")
-    for item_id in block_items:
-        try:
-            if canvas.type(item_id) == "rectangle":
-                rect_item_id = item_id
-                break
-        except tk.TclError:
-            pass
-    assert rect_item_id is not None, "Rectangle for block not found"
+    rect_item_id, _ = timeline_panel.add_block(obj_id=test_id, obj_type="Circle")
 
     # Get coordinates of the rectangle to simulate a click inside it
     coords = canvas.coords(rect_item_id)
@@ -156,9 +119,8 @@ def test_timeline_panel_click_block_selects(root, mocker):
     # Assert UIManager was called with the correct ID
     mock_ui_manager.handle_timeline_selection.assert_called_once_with(test_id)
 
-def test_timeline_panel_click_background_deselects(root, mocker):
+def test_timeline_panel_click_background_deselects(root, mock_ui_manager, mocker):
     """Test clicking the background calls ui_manager.handle_timeline_selection with None."""
-    mock_ui_manager = mocker.Mock()
     timeline_panel = TimelinePanel(root, mock_ui_manager)
     # Give the canvas a defined size
     timeline_panel.pack(padx=20, pady=20)
@@ -166,11 +128,6 @@ def test_timeline_panel_click_background_deselects(root, mocker):
     canvas = timeline_panel.canvas
     canvas.pack(fill=tk.BOTH, expand=True)
     root.update_idletasks()
-    timeline_panel._draw_placeholder_text() # Ensure placeholder drawn initially if needed
-
-    # Optional: Add a block to ensure we're not clicking it
-    timeline_panel.add_block(obj_id="dummy_id", obj_type="Square")
-    root.update_idletasks()
 
     # Simulate a click far away from any potential blocks (e.g., near corner)
     # Use coordinates guaranteed to be outside the first block
@@ -198,74 +155,40 @@ def test_timeline_panel_click_background_deselects(root, mocker):
     # Assert UIManager was called with None
     mock_ui_manager.handle_timeline_selection.assert_called_once_with(None)
 
-def test_timeline_panel_highlight_block(root, mocker):
-    """Test that highlight_block changes the outline of the correct block."""
-    mock_ui_manager = mocker.Mock() # Not strictly needed, but keep pattern
+def test_timeline_panel_highlight_block_updates_outline(root, mock_ui_manager):
+    """Test that highlight_block restyles the canvas rectangles when switching and clearing."""
     timeline_panel = TimelinePanel(root, mock_ui_manager)
     timeline_panel.pack(fill=tk.BOTH, expand=True)
-    root.update_idletasks()
     canvas = timeline_panel.canvas
-    timeline_panel._draw_placeholder_text()
 
     # Add two blocks
     id1 = "circle_1"
     id2 = "square_2"
     timeline_panel.add_block(obj_id=id1, obj_type="Circle")
     timeline_panel.add_block(obj_id=id2, obj_type="Square")
-    root.update_idletasks()
-
-    # Helper to find rectangle ID for an object ID
-    def find_rect_id(obj_id):
-        for rect_id, mapped_obj_id in timeline_panel.object_canvas_items.items():
-            if mapped_obj_id == obj_id:
-                # Verify it's actually a rectangle before returning
-                try:
-                    if canvas.type(rect_id) == "rectangle":
-                        return rect_id
-                except tk.TclError:
-                    pass # Item might not exist
-        return None
-
-    rect_id1 = find_rect_id(id1)
-    rect_id2 = find_rect_id(id2)
-    assert rect_id1 is not None, f"Rectangle for {id1} not found"
-    assert rect_id2 is not None, f"Rectangle for {id2} not found"
-
-    default_outline = "black" # As defined in add_block
-    highlight_outline = "red" # Define highlight color
-    highlight_width = 2 # Define highlight width
-    default_width = 1
-
-    # Initial state: both should have default outline
-    assert canvas.itemcget(rect_id1, "outline") == default_outline
-    assert canvas.itemcget(rect_id2, "outline") == default_outline
-    assert int(float(canvas.itemcget(rect_id1, "width"))) == default_width
-    assert int(float(canvas.itemcget(rect_id2, "width"))) == default_width
 
+    # Reverse lookup: object ID -> rectangle ID
+    rect_id1 = timeline_panel.rect_by_obj_id[id1]
+    rect_id2 = timeline_panel.rect_by_obj_id[id2]
+    assert timeline_panel.object_canvas_items[rect_id1] == id1
+    assert timeline_panel.object_canvas_items[rect_id2] == id2
 
     # Highlight block 1
     timeline_panel.highlight_block(id1)
-    root.update_idletasks()
-    assert canvas.itemcget(rect_id1, "outline") == highlight_outline
-    assert int(float(canvas.itemcget(rect_id1, "width"))) == highlight_width
-    assert canvas.itemcget(rect_id2, "outline") == default_outline # Block 2 unchanged
-    assert int(float(canvas.itemcget(rect_id2, "width"))) == default_width
+    assert canvas.itemcget(rect_id1, "outline") == "red" # Highlight color
+    assert canvas.itemcget(rect_id2, "outline") == "black" # Default color
 
     # Highlight block 2 (should deselect block 1)
     timeline_panel.highlight_block(id2)
-    root.update_idletasks()
-    assert canvas.itemcget(rect_id1, "outline") == default_outline # Block 1 back to default
-    assert int(float(canvas.itemcget(rect_id1, "width"))) == default_width
-    assert canvas.itemcget(rect_id2, "outline") == highlight_outline
-    assert int(float(canvas.itemcget(rect_id2, "width"))) == highlight_width
+    assert canvas.itemcget(rect_id1, "outline") == "black"
+    assert canvas.itemcget(rect_id2, "outline") == "red"
+    assert timeline_panel.highlighted_id == id2 # Next switch restyles only this block and the new one
 
     # Deselect all
     timeline_panel.highlight_block(None)
-    root.update_idletasks()
-    assert canvas.itemcget(rect_id1, "outline") == default_outline
-    assert int(float(canvas.itemcget(rect_id1, "width"))) == default_width
-    assert canvas.itemcget(rect_id2, "outline") == default_outline
-    assert int(float(canvas.itemcget(rect_id2, "width"))) == default_width
+    assert canvas.itemcget(rect_id1, "outline") == "black"
+    assert canvas.itemcget(rect_id2, "outline") == "black"
+    assert timeline_panel.highlighted_id is None
 
 # def test_timeline_panel_highlight_block(root, mocker):
 #     pass 
\ No newline at end of file
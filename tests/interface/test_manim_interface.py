@@ -6,12 +6,35 @@ from unittest.mock import MagicMock, patch, mock_open
 import pathlib
 import tempfile # Import tempfile
 import threading # Import threading
+import concurrent.futures # Import the worker pool
 import subprocess # Import subprocess
 import os # Import os for cleanup test later
+import io # Import io for piped output
+import sys # Import sys for the interpreter path
 
 # We expect ManimInterface to be in src/easymanim/interface/manim_interface.py
+from easymanim.interface import manim_interface
 from easymanim.interface.manim_interface import ManimInterface
 
+@pytest.fixture(autouse=True)
+def no_import_warmup(monkeypatch):
+    """Don't spawn the background `import manim` process while testing."""
+    monkeypatch.setattr(manim_interface, '_IMPORT_WARMED', True)
+
+@pytest.fixture(autouse=True)
+def isolated_interfaces(monkeypatch, tmp_path):
+    """Create script dirs under tmp_path and close every interface the test built."""
+    created = []
+    original_init = ManimInterface.__init__
+    def tracking_init(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        created.append(self)
+    monkeypatch.setattr(ManimInterface, '_script_dir_base', staticmethod(lambda: str(tmp_path)))
+    monkeypatch.setattr(ManimInterface, '__init__', tracking_init)
+    yield created
+    for interface in created:
+        interface.close()
+
 # Define a dummy class to mock MainApplication for type hints and basic function
 class MockMainApplication:
     def schedule_task(self, callback, *args):
@@ -19,6 +42,22 @@ class MockMainApplication:
         # or use a mock to check if it was called
         pass 
 
+def run_now(callback, *args):
+    """schedule_task stand-in that runs the task immediately, as the Tk main loop would."""
+    callback(*args)
+
+def fake_popen(returncode=0, stdout=b"", stderr=b""):
+    """Build a subprocess.Popen side effect that writes Manim output to the redirected files."""
+    def _popen(command, **kwargs):
+        process = MagicMock(wait=MagicMock(return_value=returncode))
+        if kwargs['stdout'] == subprocess.PIPE: # PNG previews stream stdout
+            process.stdout = io.BytesIO(stdout)
+        else:
+            kwargs['stdout'].write(stdout)
+        kwargs['stderr'].write(stderr)
+        return process
+    return _popen
+
 class TestManimInterface:
     """Test suite for the ManimInterface."""
 
@@ -33,23 +72,87 @@ class TestManimInterface:
         
         assert hasattr(interface, 'temp_script_dir'), "Should have a temp_script_dir attribute"
         assert isinstance(interface.temp_script_dir, pathlib.Path), "temp_script_dir should be a Path object"
+        # Location is platform dependent (/dev/shm when writable, else the system temp dir);
+        # the isolated_interfaces fixture points it at tmp_path
+        assert interface.temp_script_dir.is_dir(), "temp_script_dir should be created"
         # We might test directory *creation* later or assume it happens here
         # For now, just check the attribute exists and is the right type
 
-    @patch('tempfile.NamedTemporaryFile')
-    def test_render_async_writes_script_to_temp_file(self, mock_named_temp_file, mocker):
-        """Verify render_async creates and writes to a temporary script file.
+    def test_close_removes_temp_script_dir(self):
+        """Verify close() deletes temp_script_dir together with the scripts in it."""
+        interface = ManimInterface(root_app=MockMainApplication())
+        interface._write_script("class CloseScene(Scene): pass")
+
+        interface.close()
+
+        assert not interface.temp_script_dir.exists()
+        interface.close() # Safe to call again
+
+    def test_close_cancels_queued_runs_and_terminates_running_ones(self):
+        """Verify close() shuts the pool down without waiting and stops running Manim processes."""
+        interface = ManimInterface(root_app=MockMainApplication())
+        running, finished = MagicMock(), MagicMock()
+        running.poll.return_value = None
+        finished.poll.return_value = 0
+        interface._in_flight = {("A", "png"): running, ("B", "mp4"): finished}
+        interface._pool = MagicMock()
+
+        interface.close()
+
+        interface._pool.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+        running.terminate.assert_called_once()
+        finished.terminate.assert_not_called()
+        assert interface._in_flight == {}
+
+    def test_flush_after_close_starts_no_render(self):
+        """Verify a coalescing timer that fired during close() starts nothing on the shut-down pool."""
+        mock_app = MockMainApplication()
+        mock_app.schedule_task = MagicMock(side_effect=run_now)
+        interface = ManimInterface(root_app=mock_app)
+        mock_callback = MagicMock()
+
+        interface.close()
+        interface._flush_pending() # The timer thread was already running
+        interface._start_render("class Late(Scene): pass", "LateScene", ["-s", "-ql"], "png", mock_callback)
+        interface.render_async("class Late(Scene): pass", "LateScene", ["-s", "-ql"], "png", mock_callback)
+
+        # No "cannot schedule new futures after shutdown" failure is reported
+        mock_callback.assert_not_called()
+        assert interface._pending == {}
+        assert interface._scripts_in_use == {}
+
+    @patch('subprocess.Popen')
+    def test_init_warms_manim_import_once(self, mock_popen, monkeypatch):
+        """Verify the first interface starts a detached `import manim`, later ones don't."""
+        monkeypatch.setattr(manim_interface, '_IMPORT_WARMED', False)
+
+        ManimInterface(root_app=MockMainApplication())
+        ManimInterface(root_app=MockMainApplication())
+
+        mock_popen.assert_called_once_with([sys.executable, '-c', 'import manim'],
+                                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                           start_new_session=True)
+
+    @patch('subprocess.Popen')
+    def test_close_reaps_warmup_process(self, mock_popen, monkeypatch):
+        """Verify close() stops a still-running warm-up import and waits for it."""
+        monkeypatch.setattr(manim_interface, '_IMPORT_WARMED', False)
+        warmup = mock_popen.return_value
+        warmup.poll.return_value = None # Still importing
+
+        interface = ManimInterface(root_app=MockMainApplication())
+        interface.close()
+
+        warmup.terminate.assert_called_once()
+        warmup.wait.assert_called_once_with(timeout=1)
+        assert interface._warmup_process is None
+
+    @patch('concurrent.futures.ThreadPoolExecutor.submit') # Don't launch Manim
+    @patch('threading.Timer') # Tests close the coalescing window by hand
+    def test_render_async_writes_script_to_temp_file(self, mock_timer, mock_submit, mocker):
+        """Verify render_async writes the script to a content-addressed file in temp_script_dir.
         Red Step: Requires render_async method implementation.
-        Uses mocker to patch tempfile.NamedTemporaryFile.
         """
-        # Setup mock for the file handle returned by NamedTemporaryFile
-        mock_file_handle = MagicMock()
-        # Configure the context manager behavior
-        mock_named_temp_file.return_value.__enter__.return_value = mock_file_handle
-        # Store the dummy path in the mock file handle
-        dummy_script_path = "/tmp/dummy_script_xyz.py"
-        mock_file_handle.name = dummy_script_path
-
         mock_app = MockMainApplication()
         interface = ManimInterface(root_app=mock_app)
         
@@ -67,33 +170,56 @@ class TestManimInterface:
             output_format=dummy_format,
             callback=mock_callback
         )
-
-        # Assert NamedTemporaryFile was called correctly
-        mock_named_temp_file.assert_called_once_with(
-            mode='w', 
-            suffix='.py', 
-            delete=False, # Important for passing path to subprocess
-            dir=str(interface.temp_script_dir), # Ensure it's a string if needed by mock
-            encoding='utf-8' # Good practice to specify encoding
-        )
-
-        # Assert write was called with the script content on the mock file handle
-        mock_file_handle.write.assert_called_once_with(dummy_script_content)
-        # Assert the context manager was used (implies close)
-        assert mock_named_temp_file.return_value.__exit__.called
-
-    @patch('threading.Thread') # Patch the Thread class
-    @patch('tempfile.NamedTemporaryFile') # Still need to patch file writing
-    def test_render_async_starts_thread(self, mock_named_temp_file, mock_thread, mocker):
-        """Verify render_async starts a thread targeting _run_manim_thread.
-        Red Step: Requires render_async to instantiate and start threading.Thread.
+        # Close the coalescing window now instead of waiting for the timer
+        interface._flush_pending()
+
+        # Assert the script was written under its content hash
+        expected_path = interface.temp_script_dir / f"{ManimInterface._script_hash(dummy_script_content)}.py"
+        assert expected_path.read_text(encoding='utf-8') == dummy_script_content
+        # ...and that path is what the Manim run receives
+        assert mock_submit.call_args.args[1] == str(expected_path)
+
+    def test_write_script_without_o_tmpfile(self, monkeypatch):
+        """Verify the rename fallback writes the script once and leaves no temp files behind."""
+        monkeypatch.delattr(os, 'O_TMPFILE', raising=False)
+        interface = ManimInterface(root_app=MockMainApplication())
+
+        script = "class FallbackScene(Scene): pass"
+        first = interface._write_script(script)
+        second = interface._write_script(script)
+
+        assert first == second == str(interface.temp_script_dir / f"{ManimInterface._script_hash(script)}.py")
+        assert pathlib.Path(first).read_text(encoding='utf-8') == script
+        assert os.listdir(interface.temp_script_dir) == [os.path.basename(first)]
+
+    def test_prune_script_cache_evicts_least_recently_used(self, monkeypatch):
+        """Verify reusing a script protects it from pruning, and held scripts are never pruned."""
+        monkeypatch.setattr(ManimInterface, 'SCRIPT_CACHE_SIZE', 2)
+        interface = ManimInterface(root_app=MockMainApplication())
+        def age(*paths): # Oldest first, all well in the past
+            for i, path in enumerate(paths):
+                os.utime(path, (1000 + i, 1000 + i))
+
+        reused = interface._write_script("class Reused(Scene): pass")
+        idle = interface._write_script("class Idle(Scene): pass")
+        age(reused, idle)
+        interface._write_script("class Reused(Scene): pass") # Reuse refreshes the mtime
+        newest = interface._write_script("class Newest(Scene): pass") # Over the limit: prune
+        assert os.path.exists(reused), "Recently reused script should be kept"
+        assert not os.path.exists(idle), "Least recently used script should be pruned"
+
+        age(reused, newest)
+        interface._hold_script(reused) # Its job is still queued
+        interface._write_script("class Another(Scene): pass")
+        assert os.path.exists(reused), "Held script must never be pruned"
+        assert not os.path.exists(newest)
+
+    @patch('threading.Timer') # Tests close the coalescing window by hand
+    @patch('concurrent.futures.ThreadPoolExecutor.submit') # Patch the pool's submit
+    def test_render_async_submits_to_pool(self, mock_submit, mock_timer, mocker):
+        """Verify render_async submits _run_manim_thread to the worker pool.
+        Red Step: Requires render_async to hand the run to the ThreadPoolExecutor.
         """
-        # Setup mock for file writing
-        mock_file_handle = MagicMock()
-        mock_named_temp_file.return_value.__enter__.return_value = mock_file_handle
-        dummy_script_path = "/tmp/dummy_script_thread.py"
-        mock_file_handle.name = dummy_script_path
-
         mock_app = MockMainApplication()
         interface = ManimInterface(root_app=mock_app)
         # Add a dummy _run_manim_thread for the target check to work during test
@@ -114,40 +240,215 @@ class TestManimInterface:
             output_format=dummy_format,
             callback=mock_callback
         )
+        interface._flush_pending() # Close the coalescing window
 
-        # Assert threading.Thread was called
-        mock_thread.assert_called_once()
+        # Assert the run was submitted once
+        mock_submit.assert_called_once()
         
-        # Get the arguments passed to the Thread constructor
-        call_args, call_kwargs = mock_thread.call_args
+        # Get the arguments passed to submit: (fn, *args)
+        submitted_fn, *submitted_args = mock_submit.call_args.args
         
         # Check the target
-        assert call_kwargs.get('target') == interface._run_manim_thread
+        assert submitted_fn == interface._run_manim_thread
         
         # Check the arguments passed to the target
+        dummy_script_path = str(interface.temp_script_dir / f"{ManimInterface._script_hash(dummy_script_content)}.py")
         expected_args = (
-            dummy_script_path, # Path from mock file handle
+            dummy_script_path, # Content-addressed script path
             dummy_scene_name,
             dummy_flags,
             dummy_format,
-            mock_callback
+            mock_callback,
+            1 # First generation for this scene/format
         )
-        assert call_kwargs.get('args') == expected_args
+        assert tuple(submitted_args) == expected_args
 
-        # Assert the start method was called on the thread instance
-        mock_thread.return_value.start.assert_called_once()
+    @patch('threading.Timer')
+    @patch('concurrent.futures.ThreadPoolExecutor.submit')
+    def test_render_async_coalesces_rapid_requests(self, mock_submit, mock_timer):
+        """Verify requests for the same scene within the window share one render.
+        Only the newest script is written, and every callback gets the result.
+        """
+        interface = ManimInterface(root_app=MockMainApplication())
+        first_callback = MagicMock()
+        second_callback = MagicMock()
+
+        # Two clicks before the timer elapses
+        interface.render_async("old script", "PreviewScene", ["-s", "-ql"], "png", first_callback)
+        interface.render_async("new script", "PreviewScene", ["-s", "-ql"], "png", second_callback)
+        assert mock_timer.call_count == 2, "Each request should restart the window"
+        mock_timer.return_value.cancel.assert_called()
+        interface._flush_pending()
+
+        # One script write (the newest) and one Manim run
+        assert [p.read_text() for p in interface.temp_script_dir.glob("*.py")] == ["new script"]
+        mock_submit.assert_called_once()
+
+        # The callback handed to the run fans out to both requesters
+        thread_callback = mock_submit.call_args.args[5]
+        thread_callback(True, b"png-bytes")
+        first_callback.assert_called_once_with(True, b"png-bytes")
+        second_callback.assert_called_once_with(True, b"png-bytes")
+
+    @patch('threading.Timer')
+    def test_render_async_reuses_cached_result(self, mock_timer):
+        """Verify an unchanged script with the same settings is served from the result cache."""
+        mock_app = MockMainApplication()
+        mock_app.schedule_task = MagicMock(side_effect=run_now)
+        interface = ManimInterface(root_app=mock_app)
 
-    @patch('subprocess.run')
-    def test_run_manim_thread_calls_subprocess_correctly_preview(self, mock_subprocess_run, mocker):
-        """Verify _run_manim_thread calls subprocess.run with correct preview args.
+        script = "Script Content"
+        cache_key = (ManimInterface._script_hash(script), "PreviewScene", ("-s", "-ql"), "png")
+        interface._store_result(cache_key, b"cached-png")
+
+        mock_callback = MagicMock()
+        interface.render_async(script, "PreviewScene", ["-s", "-ql"], "png", mock_callback)
+
+        # Served immediately: no coalescing window, no Manim run
+        mock_callback.assert_called_once_with(True, b"cached-png")
+        mock_timer.assert_not_called()
+
+    def test_results_posted_together_share_one_drain(self):
+        """Verify a burst of results costs one scheduled task, drained in arrival order."""
+        mock_app = MockMainApplication()
+        mock_app.schedule_task = MagicMock()
+        interface = ManimInterface(root_app=mock_app)
+        received = []
+
+        interface._post_result(lambda ok, data: received.append(data), True, b"first")
+        interface._post_result(lambda ok, data: received.append(data), True, b"second")
+
+        mock_app.schedule_task.assert_called_once_with(interface._drain_results)
+        interface._drain_results()
+        assert received == [b"first", b"second"]
+
+        # The next result after a drain schedules a fresh one
+        interface._post_result(lambda ok, data: received.append(data), False, "error")
+        assert mock_app.schedule_task.call_count == 2
+
+    @patch('os.unlink') # Mock cleanup
+    @patch('subprocess.Popen')
+    def test_run_manim_thread_superseded_run_is_terminated(self, mock_popen, mock_os_unlink):
+        """Verify a newer render for the same scene stops the running one and drops its result."""
+        mock_app = MockMainApplication()
+        mock_app.schedule_task = MagicMock(side_effect=run_now)
+        interface = ManimInterface(root_app=mock_app)
+        job_key = ("StaleScene", "png")
+
+        stale_process = MagicMock()
+        stale_process.poll.return_value = None # Still running
+        def wait():
+            interface._supersede(job_key) # A newer request starts mid-run
+            return -15 # Killed by SIGTERM
+        stale_process.wait.side_effect = wait
+        mock_popen.return_value = stale_process
+
+        mock_callback = MagicMock()
+        generation = interface._supersede(job_key)
+        interface._run_manim_thread("/tmp/dummy_stale.py", "StaleScene", ["-s", "-ql"], "png",
+                                    mock_callback, generation)
+
+        stale_process.terminate.assert_called_once()
+        mock_callback.assert_not_called()
+        assert job_key not in interface._in_flight
+
+    @patch('os.unlink') # Mock cleanup
+    @patch('subprocess.Popen')
+    def test_superseded_callbacks_receive_newer_result(self, mock_popen, mock_os_unlink, mocker):
+        """Verify callbacks of a superseded run are answered by the run that replaced it."""
+        mock_app = MockMainApplication()
+        mock_app.schedule_task = MagicMock(side_effect=run_now)
+        interface = ManimInterface(root_app=mock_app)
+        mocker.patch.object(interface, '_find_mp4', return_value="/abs/NewScene.mp4")
+        mock_popen.side_effect = fake_popen(returncode=0)
+        job_key = ("NewScene", "mp4")
+        old_callback, new_callback = MagicMock(), MagicMock()
+
+        old_generation = interface._supersede(job_key, old_callback)
+        new_generation = interface._supersede(job_key, new_callback) # Arrives while the first is queued
+        interface._run_manim_thread("/tmp/dummy_old.py", "NewScene", ["-ql"], "mp4",
+                                    old_callback, old_generation)
+        old_callback.assert_not_called() # Nothing to report yet
+        interface._run_manim_thread("/tmp/dummy_new.py", "NewScene", ["-ql"], "mp4",
+                                    new_callback, new_generation)
+
+        old_callback.assert_called_once_with(True, "/abs/NewScene.mp4")
+        new_callback.assert_called_once_with(True, "/abs/NewScene.mp4")
+        assert job_key not in interface._waiting
+
+    @patch('threading.Timer') # Keep the pending request pending
+    @patch('os.unlink') # Mock cleanup
+    @patch('subprocess.Popen')
+    def test_cache_hit_supersedes_older_renders(self, mock_popen, mock_os_unlink, mock_timer):
+        """Verify a cached result arriving while an older render runs is the last one delivered."""
+        mock_app = MockMainApplication()
+        mock_app.schedule_task = MagicMock(side_effect=run_now)
+        interface = ManimInterface(root_app=mock_app)
+        job_key = ("HitScene", "png")
+        flags = ["-s", "-ql"]
+        delivered = []
+        def recorder(name):
+            return lambda success, result: delivered.append((name, success, result))
+
+        cached_script = "class HitScene(Scene): pass"
+        interface._store_result((ManimInterface._script_hash(cached_script), "HitScene", tuple(flags), "png"),
+                                b"cached-png")
+
+        slow_process = MagicMock()
+        slow_process.poll.return_value = None # Still running
+        slow_process.stdout = io.BytesIO(b"")
+        def wait():
+            # While render A is slow, a request with another script waits to be
+            # coalesced, then an unchanged scene (B) is served from the cache
+            interface.render_async("class Pending(Scene): pass", "HitScene", flags, "png", recorder("pending"))
+            interface.render_async(cached_script, "HitScene", flags, "png", recorder("B"))
+            return 0 # A still completes after B was answered
+        slow_process.wait.side_effect = wait
+        mock_popen.return_value = slow_process
+
+        generation = interface._supersede(job_key, recorder("A"))
+        interface._run_manim_thread("/tmp/dummy_slow.py", "HitScene", flags, "png",
+                                    recorder("A"), generation)
+
+        slow_process.terminate.assert_called_once()
+        assert interface._pending == {}, "The superseded pending request should be dropped"
+        assert sorted(name for name, _, _ in delivered) == ["A", "B", "pending"]
+        assert all((success, result) == (True, b"cached-png") for _, success, result in delivered), "Only B's result is delivered"
+        assert delivered[-1][0] == "B"
+
+    @patch('os.unlink') # Mock cleanup
+    @patch('subprocess.Popen')
+    def test_run_manim_thread_superseded_while_queued_never_starts_manim(self, mock_popen, mock_os_unlink):
+        """Verify a job superseded before a worker picks it up never spawns a Manim process."""
+        mock_app = MockMainApplication()
+        mock_app.schedule_task = MagicMock(side_effect=run_now)
+        interface = ManimInterface(root_app=mock_app)
+        job_key = ("QueuedScene", "png")
+
+        stale_generation = interface._supersede(job_key)
+        interface._supersede(job_key) # A newer request arrives while the first is queued
+        mock_callback = MagicMock()
+        interface._run_manim_thread("/tmp/dummy_queued.py", "QueuedScene", ["-s", "-ql"], "png",
+                                    mock_callback, stale_generation)
+
+        mock_popen.assert_not_called()
+        mock_callback.assert_not_called()
+        mock_os_unlink.assert_called_once_with("/tmp/dummy_queued.py") # Still cleaned up
+
+    @patch('tempfile.TemporaryFile')
+    @patch('subprocess.Popen')
+    def test_run_manim_thread_calls_subprocess_correctly_preview(self, mock_popen, mock_temp_file, mocker):
+        """Verify _run_manim_thread starts Manim via subprocess.Popen with correct preview args.
         Red Step: Requires _run_manim_thread to construct and run the command.
         """
-        # Mock the return value of subprocess.run to avoid errors in this test
-        mock_subprocess_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        # Mock a clean exit; stdout is piped, so only stderr gets a temp file
+        mock_popen.return_value.wait.return_value = 0
+        err_cm = MagicMock()
+        mock_temp_file.side_effect = [err_cm]
 
         mock_app = MockMainApplication()
         # Mock the schedule_task to check callbacks later if needed
-        mock_app.schedule_task = MagicMock()
+        mock_app.schedule_task = MagicMock(side_effect=run_now)
         interface = ManimInterface(root_app=mock_app)
         
         # Arguments for the thread function
@@ -169,27 +470,31 @@ class TestManimInterface:
 
         # Construct the expected command list
         expected_command = [
-            'python', '-m', 'manim', 
+            sys.executable, '-m', 'manim', 
             dummy_script_path, 
             dummy_scene_name
         ] + dummy_flags
 
-        # Assert subprocess.run was called correctly
-        mock_subprocess_run.assert_called_once_with(
-            expected_command, 
-            capture_output=True, 
-            text=True, 
-            check=False # Important: we check returncode manually
+        # Assert Popen was called correctly: stdout piped for early PNG pickup,
+        # stderr redirected to its temp file
+        mock_popen.assert_called_once_with(
+            expected_command,
+            stdout=subprocess.PIPE,
+            stderr=err_cm.__enter__.return_value
         )
+        mock_popen.return_value.wait.assert_called_once() # We check returncode manually
 
-    @patch('subprocess.run')
-    def test_run_manim_thread_calls_subprocess_correctly_render(self, mock_subprocess_run, mocker):
-        """Verify _run_manim_thread calls subprocess.run with correct render args.
+    @patch('tempfile.TemporaryFile')
+    @patch('subprocess.Popen')
+    def test_run_manim_thread_calls_subprocess_correctly_render(self, mock_popen, mock_temp_file, mocker):
+        """Verify _run_manim_thread starts Manim via subprocess.Popen with correct render args.
         Green Step: Should pass with current implementation.
         """
-        mock_subprocess_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        mock_popen.return_value.wait.return_value = 0
+        out_cm, err_cm = MagicMock(), MagicMock()
+        mock_temp_file.side_effect = [out_cm, err_cm]
         mock_app = MockMainApplication()
-        mock_app.schedule_task = MagicMock()
+        mock_app.schedule_task = MagicMock(side_effect=run_now)
         interface = ManimInterface(root_app=mock_app)
         
         dummy_script_path = "/tmp/dummy_render.py"
@@ -208,45 +513,27 @@ class TestManimInterface:
         )
 
         expected_command = [
-            'python', '-m', 'manim', 
+            sys.executable, '-m', 'manim', 
             dummy_script_path, 
             dummy_scene_name
         ] + dummy_flags
 
-        mock_subprocess_run.assert_called_once_with(
-            expected_command, 
-            capture_output=True, 
-            text=True, 
-            check=False
+        mock_popen.assert_called_once_with(
+            expected_command,
+            stdout=out_cm.__enter__.return_value,
+            stderr=err_cm.__enter__.return_value
         )
 
-    @patch('os.remove') # Mock cleanup
-    @patch('pathlib.Path') # Mock Path for glob and read_bytes
-    @patch('subprocess.run') # Mock subprocess
-    def test_run_manim_thread_schedules_success_callback_png(self, mock_subprocess_run, MockPath, mock_os_remove, mocker):
+    @patch('os.unlink') # Mock cleanup
+    @patch('os.path.exists') # Direct lookup of the output PNG
+    @patch('subprocess.Popen') # Mock subprocess
+    def test_run_manim_thread_schedules_success_callback_png(self, mock_popen, mock_os_path_exists, mock_os_unlink, mocker):
         """Verify _run_manim_thread schedules callback with PNG bytes on success.
         Red Step: Requires result checking, file finding, reading, and callback scheduling.
         """
         # --- Mock subprocess success --- 
-        mock_subprocess_run.return_value = MagicMock(returncode=0, stdout="Success!", stderr="")
-
-        # --- Mock pathlib.Path --- 
-        # Instance needed for the glob call
-        mock_path_instance = MagicMock()
-        # Configure the glob method to return a list with one mock file path
-        mock_output_file_path = MagicMock()
-        mock_path_instance.glob.return_value = [mock_output_file_path]
-        # Configure the read_bytes method on the mock file path
-        mock_png_bytes = b'\x89PNG\r\n\x1a\n' # Minimal PNG header
-        mock_output_file_path.read_bytes.return_value = mock_png_bytes
-        # Make Path('.') return our mock instance that has glob
-        MockPath.return_value = mock_path_instance 
-        
-        # --- Mock App and Interface --- 
-        mock_app = MockMainApplication()
-        mock_app.schedule_task = MagicMock()
-        interface = ManimInterface(root_app=mock_app)
-        
+        mock_popen.side_effect = fake_popen(returncode=0, stdout=b"Success!")
+
         # --- Args for thread function --- 
         dummy_script_path = "/tmp/dummy_success.py"
         dummy_scene_name = "SuccessScene"
@@ -254,6 +541,19 @@ class TestManimInterface:
         dummy_format = "png"
         mock_callback = MagicMock()
 
+        # --- Mock the output file: found at its exact path, read in binary mode ---
+        expected_png_path = os.path.join('.', 'media', 'images', 'dummy_success', f"{dummy_scene_name}.png")
+        mock_os_path_exists.side_effect = lambda path: path in (expected_png_path, dummy_script_path)
+        mock_scandir = mocker.patch('os.scandir')
+        mock_png_bytes = b'\x89PNG\r\n\x1a\n' # Minimal PNG header
+        mock_file = mocker.patch('easymanim.interface.manim_interface.open',
+                                 mock_open(read_data=mock_png_bytes), create=True)
+        
+        # --- Mock App and Interface --- 
+        mock_app = MockMainApplication()
+        mock_app.schedule_task = MagicMock(side_effect=run_now)
+        interface = ManimInterface(root_app=mock_app)
+
         # --- Call the method --- 
         interface._run_manim_thread(
             script_path=dummy_script_path,
@@ -264,34 +564,91 @@ class TestManimInterface:
         )
 
         # --- Assertions --- 
-        # 1. Check that glob was called correctly to find the output file
-        expected_glob_pattern = f"media/images/{pathlib.Path(dummy_script_path).stem}/{dummy_scene_name}*.png"
-        mock_path_instance.glob.assert_called_once_with(expected_glob_pattern)
+        # 1. The exact path was checked, so no directory scan was needed
+        mock_os_path_exists.assert_any_call(expected_png_path)
+        mock_scandir.assert_not_called()
         
-        # 2. Check that read_bytes was called on the found file
-        mock_output_file_path.read_bytes.assert_called_once()
+        # 2. Check that the found file was read in binary mode
+        mock_file.assert_called_once_with(expected_png_path, 'rb')
         
-        # 3. Check that schedule_task was called with success and image bytes
-        mock_app.schedule_task.assert_called_once_with(mock_callback, True, mock_png_bytes)
+        # 3. Check that the callback received success and image bytes
+        mock_callback.assert_called_once_with(True, mock_png_bytes)
         
         # 4. Check cleanup (will be tested more thoroughly later)
-        # mock_os_remove.assert_called_once_with(dummy_script_path) 
+        # mock_os_unlink.assert_called_once_with(dummy_script_path) 
+
+    @patch('os.unlink') # Mock cleanup
+    @patch('subprocess.Popen')
+    def test_run_manim_thread_streams_image_before_exit(self, mock_popen, mock_os_unlink, mocker):
+        """Verify the preview PNG is delivered when Manim logs it, before the process exits."""
+        mock_app = MockMainApplication()
+        mock_app.schedule_task = MagicMock(side_effect=run_now)
+        interface = ManimInterface(root_app=mock_app)
+        mock_callback = MagicMock()
 
-    @patch('os.remove') # Mock cleanup
-    @patch('subprocess.run') 
+        png_path = os.path.join('.', 'media', 'images', 'dummy_stream', 'StreamScene.png')
+        mocker.patch('os.path.exists', side_effect=lambda path: path == png_path)
+        mocker.patch('easymanim.interface.manim_interface.open',
+                     mock_open(read_data=b'png'), create=True)
+
+        process = MagicMock()
+        process.stdout = io.BytesIO(b"INFO     Rendering...\n"
+                                    b"INFO     File ready at '/media/images/dummy_stream/StreamScene.png'\n"
+                                    b"INFO     Cleaning up\n")
+        def wait():
+            # Manim is still shutting down, yet the image is already with the UI
+            mock_callback.assert_called_once_with(True, b'png')
+            return 0
+        process.wait.side_effect = wait
+        mock_popen.return_value = process
+
+        interface._run_manim_thread("/tmp/dummy_stream.py", "StreamScene", ["-s", "-ql"], "png", mock_callback)
+
+        process.wait.assert_called_once()
+        mock_callback.assert_called_once_with(True, b'png') # Not delivered a second time
+
+    @patch('os.unlink') # Mock cleanup
+    @patch('os.path.exists', return_value=False) # Exact name misses
+    @patch('subprocess.Popen')
+    def test_run_manim_thread_png_falls_back_to_directory_scan(self, mock_popen, mock_os_path_exists, mock_os_unlink, mocker):
+        """Verify a suffixed PNG name (e.g. version-stamped) is found by scanning the images dir."""
+        mock_popen.side_effect = fake_popen(returncode=0)
+
+        images_dir = os.path.join('.', 'media', 'images', 'dummy_scan')
+        other = MagicMock(path=os.path.join(images_dir, 'OtherScene.png'))
+        other.name = 'OtherScene.png'
+        match = MagicMock(path=os.path.join(images_dir, 'ScanScene_ManimCE_v0.18.0.png'))
+        match.name = 'ScanScene_ManimCE_v0.18.0.png'
+        mock_scandir = mocker.patch('os.scandir')
+        mock_scandir.return_value.__enter__.return_value = iter([other, match])
+        mock_file = mocker.patch('easymanim.interface.manim_interface.open',
+                                 mock_open(read_data=b'png'), create=True)
+
+        mock_app = MockMainApplication()
+        mock_app.schedule_task = MagicMock(side_effect=run_now)
+        interface = ManimInterface(root_app=mock_app)
+        mock_callback = MagicMock()
+
+        interface._run_manim_thread("/tmp/dummy_scan.py", "ScanScene", ["-s", "-ql"], "png", mock_callback)
+
+        mock_scandir.assert_called_once_with(images_dir)
+        mock_file.assert_called_once_with(match.path, 'rb')
+        mock_callback.assert_called_once_with(True, b'png')
+
+    @patch('os.unlink') # Mock cleanup
+    @patch('subprocess.Popen') 
     # Patch os.path.exists now
     @patch('os.path.exists') 
-    def test_run_manim_thread_schedules_success_callback_mp4(self, mock_os_path_exists, mock_subprocess_run, mock_os_remove, mocker):
+    def test_run_manim_thread_schedules_success_callback_mp4(self, mock_os_path_exists, mock_popen, mock_os_unlink, mocker):
         """Verify _run_manim_thread schedules callback with MP4 path on success.
         Uses os.path.exists mock.
         """
         # --- Mock subprocess --- 
-        mock_result = MagicMock(returncode=0, stdout="Video Success!", stderr="")
-        mock_subprocess_run.return_value = mock_result # Assign directly
+        mock_popen.side_effect = fake_popen(returncode=0, stdout=b"Video Success!")
 
         # --- Mock App and Interface --- 
         mock_app = MockMainApplication()
-        mock_app.schedule_task = MagicMock()
+        mock_app.schedule_task = MagicMock(side_effect=run_now)
         interface = ManimInterface(root_app=mock_app)
         
         # --- Args for thread function --- 
@@ -335,36 +692,42 @@ class TestManimInterface:
         # --- Assertions --- 
         # 1. Check that os.path.exists was called with expected paths
         mock_os_path_exists.assert_any_call(expected_path_str)
-        mock_os_path_exists.assert_any_call(dummy_script_path_str)
         
-        # 2. Check that schedule_task was called with success and the path string
-        mock_app.schedule_task.assert_called_once_with(mock_callback, True, expected_path_str)
+        # 2. Check that the callback received success and the path string
+        mock_callback.assert_called_once_with(True, os.path.abspath(expected_path_str))
         
         # 3. Check cleanup 
-        mock_os_remove.assert_called_once_with(dummy_script_path_str)
+        mock_os_unlink.assert_called_once_with(dummy_script_path_str)
 
-    @patch('os.remove') 
-    @patch('os.path.exists') 
-    @patch('subprocess.run')
-    def test_run_manim_thread_schedules_failure_callback(self, mock_subprocess_run, mock_os_path_exists, mock_os_remove):
+    def test_find_mp4_scans_for_frame_rate_suffixed_dir(self, tmp_path, monkeypatch):
+        """Verify the video is found under Manim's real quality dir name (e.g. 480p15)."""
+        monkeypatch.chdir(tmp_path)
+        video_dir = tmp_path / "media" / "videos" / "dummy_fps" / "480p15"
+        video_dir.mkdir(parents=True)
+        (video_dir / "FpsScene.mp4").write_bytes(b"mp4")
+        interface = ManimInterface(root_app=MockMainApplication())
+
+        found = interface._find_mp4("dummy_fps", "FpsScene", ["-ql"])
+
+        assert found == str(video_dir / "FpsScene.mp4") # Absolute, not relative to the cwd
+        assert interface._find_mp4("dummy_fps", "MissingScene", ["-ql"]) is None
+
+    @patch('os.unlink') 
+    @patch('subprocess.Popen')
+    def test_run_manim_thread_schedules_failure_callback(self, mock_popen, mock_os_unlink):
         """Verify _run_manim_thread schedules callback with error message on failure.
         Red Step: Requires handling of non-zero return code.
         """
         # --- Mock subprocess failure --- 
         error_output = "Traceback:\nSomething went wrong!"
-        mock_subprocess_run.return_value = MagicMock(returncode=1, stdout="", stderr=error_output)
+        progress_log = b"Animation 0: 50%\n" * 1000 # Long output before the traceback
+        mock_popen.side_effect = fake_popen(returncode=1, stderr=progress_log + error_output.encode())
 
-        # --- Mock os.path.exists for cleanup check --- 
         dummy_script_path_str = "/tmp/dummy_fail.py"
-        def exists_side_effect(path_arg):
-            if path_arg == dummy_script_path_str:
-                return True # Assume script exists for cleanup
-            return False
-        mock_os_path_exists.side_effect = exists_side_effect
         
         # --- Mock App and Interface --- 
         mock_app = MockMainApplication()
-        mock_app.schedule_task = MagicMock()
+        mock_app.schedule_task = MagicMock(side_effect=run_now)
         interface = ManimInterface(root_app=mock_app)
         
         # --- Args for thread function --- 
@@ -383,41 +746,52 @@ class TestManimInterface:
         )
 
         # --- Assertions --- 
-        # 1. Check schedule_task called with failure and error message
-        # schedule_task(callback, success, result_data)
-        mock_app.schedule_task.assert_called_once()
-        call_args = mock_app.schedule_task.call_args[0]
-        assert call_args[0] == mock_callback, "Callback function mismatch"
-        assert call_args[1] is False, "Success flag should be False"
-        assert isinstance(call_args[2], str), "Result data should be an error string"
-        assert "Manim failed (code 1)" in call_args[2], "Error message should contain failure code"
-        assert error_output in call_args[2], "Error message should contain stderr"
+        # 1. Check the callback received failure and error message
+        # callback(success, result_data)
+        mock_callback.assert_called_once()
+        call_args = mock_callback.call_args[0]
+        assert call_args[0] is False, "Success flag should be False"
+        assert isinstance(call_args[1], str), "Result data should be an error string"
+        assert "Manim failed (code 1)" in call_args[1], "Error message should contain failure code"
+        assert error_output in call_args[1], "Error message should contain stderr"
+        assert len(call_args[1]) < len(progress_log), "Only the tail of stderr should be decoded"
         
         # 2. Check cleanup 
-        mock_os_remove.assert_called_once_with(dummy_script_path_str)
+        mock_os_unlink.assert_called_once_with(dummy_script_path_str)
 
-    @patch('os.remove') 
-    @patch('os.path.exists') 
-    @patch('subprocess.run')
-    def test_run_manim_thread_cleans_up_temp_file(self, mock_subprocess_run, mock_os_path_exists, mock_os_remove):
+    @patch('os.unlink') 
+    @patch('subprocess.Popen')
+    def test_run_manim_thread_png_failure_keeps_stdout_tail(self, mock_popen, mock_os_unlink):
+        """Verify a failed preview reports the end of its piped stdout, bounded in size."""
+        progress_log = b"Animation 0: 50%\n" * 1000
+        mock_popen.side_effect = fake_popen(returncode=1, stdout=progress_log + b"ValueError: bad radius\n")
+
+        mock_app = MockMainApplication()
+        mock_app.schedule_task = MagicMock(side_effect=run_now)
+        interface = ManimInterface(root_app=mock_app)
+        mock_callback = MagicMock()
+
+        interface._run_manim_thread("/tmp/dummy_png_fail.py", "FailScene", ["-s", "-ql"], "png", mock_callback)
+
+        success, message = mock_callback.call_args.args
+        assert success is False
+        assert "ValueError: bad radius" in message
+        assert len(message) < len(progress_log)
+
+    @patch('os.unlink') 
+    @patch('subprocess.Popen')
+    def test_run_manim_thread_cleans_up_temp_file(self, mock_popen, mock_os_unlink):
         """Verify _run_manim_thread removes the temp script file in finally block.
         Red Step: Requires cleanup implementation in the finally block.
         """
         # --- Mock subprocess (result doesn't matter for cleanup) --- 
-        mock_subprocess_run.return_value = MagicMock(returncode=0)
+        mock_popen.return_value.wait.return_value = 0
 
-        # --- Mock os.path.exists --- 
         dummy_script_path_str = "/tmp/dummy_cleanup.py"
-        # Simulate file existing initially, then not existing after remove is called
-        # (Though we only check remove was called once)
-        exist_results = {dummy_script_path_str: True}
-        def exists_side_effect(path_arg):
-            return exist_results.get(path_arg, False)
-        mock_os_path_exists.side_effect = exists_side_effect
         
         # --- Mock App and Interface --- 
         mock_app = MockMainApplication()
-        mock_app.schedule_task = MagicMock() # Need mock schedule_task
+        mock_app.schedule_task = MagicMock(side_effect=run_now) # Need mock schedule_task
         interface = ManimInterface(root_app=mock_app)
         
         # --- Args for thread function --- 
@@ -436,10 +810,7 @@ class TestManimInterface:
         )
 
         # --- Assertions --- 
-        # 1. Check os.path.exists was called for the script path
-        mock_os_path_exists.assert_any_call(dummy_script_path_str)
-        
-        # 2. Check os.remove was called exactly once with the script path
-        mock_os_remove.assert_called_once_with(dummy_script_path_str)
+        # Check os.unlink was called exactly once with the script path (no exists check first)
+        mock_os_unlink.assert_called_once_with(dummy_script_path_str)
 
     # Tests for failure callback, cleanup will go here 
\ No newline at end of file
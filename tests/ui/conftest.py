@@ -0,0 +1,35 @@
+import pytest
+from collections import namedtuple
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+# Field names double as the names the panels are registered under with UIManager
+Panels = namedtuple("Panels", ("timeline", "properties", "preview", "statusbar"))
+
+@pytest.fixture(scope="session")
+def mock_panels():
+    """One MagicMock per UI panel, built once per session and shared by every UI test module."""
+    return Panels(*(MagicMock() for _ in Panels._fields))
+
+@pytest.fixture(autouse=True)
+def _reset_mock_panels(mock_panels):
+    """Clear panel call history and side effects before each test.
+
+    Not return_value=True: that also resets magic methods (__bool__ would return
+    a MagicMock). Tests that read a return value configure it themselves.
+    """
+    for panel in mock_panels:
+        panel.reset_mock(side_effect=True)
+
+@pytest.fixture
+def spies(mock_panels):
+    """The panel methods UIManager drives, resolved once so tests can assert on them directly."""
+    return SimpleNamespace(
+        add_block=mock_panels.timeline.add_block,
+        display_properties=mock_panels.properties.display_properties,
+        show_placeholder=mock_panels.properties.show_placeholder,
+        display_image=mock_panels.preview.display_image,
+        show_rendering_state=mock_panels.preview.show_rendering_state,
+        show_idle_state=mock_panels.preview.show_idle_state,
+        set_status=mock_panels.statusbar.set_status,
+    )
@@ -1,15 +1,20 @@
 # tests/ui/test_ui_manager.py
 """Tests for the UIManager class."""
 
+import os
 import pytest
-from unittest.mock import MagicMock, patch
-import tkinter.messagebox # Import messagebox for mocking
+from unittest.mock import MagicMock, create_autospec, sentinel
 
 # Imports needed for type hinting and instantiation
 from easymanim.ui.ui_manager import UIManager
-# Import the classes to be mocked
-from easymanim.logic.scene_builder import SceneBuilder 
-from easymanim.interface.manim_interface import ManimInterface
+
+# EASYMANIM_STRICT_MOCKS=1 (e.g. in CI) swaps the cheap stubs below for autospec'd
+# mocks, which also reject calls whose signature the real classes do not accept
+STRICT_MOCKS = os.environ.get("EASYMANIM_STRICT_MOCKS") == "1"
+
+# Quality flags UIManager passes to render_async (as defined in architecture/checklist)
+PREVIEW_FLAGS = ('-s', '-ql') # Static image, low quality
+RENDER_FLAGS = ('-ql',)
 # Define a dummy MainApplication again (or import if it exists later)
 class MockMainApplication:
     def schedule_task(self, callback, *args):
@@ -17,40 +22,82 @@ class MockMainApplication:
         # More complex tests might check args or delay
         callback(*args)
 
-# REMOVE Dummy Panel classes - Use MagicMock directly in fixture
+class _MethodStub:
+    """Stand-in exposing only the listed methods, each a MagicMock.
+
+    Much cheaper to build than MagicMock(spec=...), and touching any other
+    attribute still raises AttributeError like a spec'd mock would.
+    """
+    _METHODS: tuple = ()
+
+    def __init__(self):
+        for name in self._METHODS:
+            setattr(self, name, MagicMock())
+
+    def reset_mock(self, **kwargs):
+        for name in self._METHODS:
+            getattr(self, name).reset_mock(**kwargs)
+
+class _FakeSceneBuilder(_MethodStub):
+    """The SceneBuilder methods UIManager calls."""
+    _METHODS = ('add_object', 'get_object_properties', 'update_object_property',
+                'set_object_animation', 'generate_script')
+
+class _FakeManimInterface(_MethodStub):
+    """The ManimInterface methods UIManager calls."""
+    _METHODS = ('render_async',)
+
+# REMOVE Dummy Panel classes - MagicMock panels come from mock_panels in conftest.py
 # class MockTimelinePanel: ... 
 # class MockPropertiesPanel: ...
 # class MockPreviewPanel: ...
 # class MockStatusBarPanel: ...
 
 # --- Test Setup Fixture (Optional but helpful) ---
-@pytest.fixture
-def ui_manager_fixture():
+# Built once per test class (MagicMocks are slow to create); _reset_ui_manager
+# restores a clean state before every test.
+@pytest.fixture(scope="class")
+def ui_manager_fixture(mock_panels):
     """Provides a UIManager instance with mocked dependencies."""
     mock_root_app = MockMainApplication()
-    mock_scene_builder = MagicMock(spec=SceneBuilder)
-    mock_manim_interface = MagicMock(spec=ManimInterface)
+    if STRICT_MOCKS:
+        from easymanim.logic.scene_builder import SceneBuilder
+        from easymanim.interface.manim_interface import ManimInterface
+        mock_scene_builder = create_autospec(SceneBuilder, instance=True)
+        mock_manim_interface = create_autospec(ManimInterface, instance=True)
+    else:
+        mock_scene_builder = _FakeSceneBuilder()
+        mock_manim_interface = _FakeManimInterface()
     
     ui_manager = UIManager(mock_root_app, mock_scene_builder, mock_manim_interface)
     
-    # Create and register mock panels using MagicMock
-    mock_timeline = MagicMock() # Removed spec=MockTimelinePanel
-    mock_properties = MagicMock() # Removed spec=MockPropertiesPanel
-    mock_preview = MagicMock() # Removed spec=MockPreviewPanel
-    mock_statusbar = MagicMock() # Removed spec=MockStatusBarPanel
-    
-    ui_manager.register_panel("timeline", mock_timeline)
-    ui_manager.register_panel("properties", mock_properties)
-    ui_manager.register_panel("preview", mock_preview)
-    ui_manager.register_panel("statusbar", mock_statusbar)
+    # Register the shared mock panels (see tests/ui/conftest.py)
+    for name, panel in mock_panels._asdict().items():
+        ui_manager.register_panel(name, panel)
     
     # Return tuple: manager and mocks for assertion checks
-    return ui_manager, mock_root_app, mock_scene_builder, mock_manim_interface, { 
-        "timeline": mock_timeline, 
-        "properties": mock_properties,
-        "preview": mock_preview,
-        "statusbar": mock_statusbar
-    }
+    return ui_manager, mock_root_app, mock_scene_builder, mock_manim_interface, mock_panels
+
+@pytest.fixture(autouse=True)
+def mock_messagebox(monkeypatch):
+    """Replaces the messagebox dialogs for every test so none can open a real window."""
+    import tkinter.messagebox # Only needed here, for patching
+    mocks = {'showerror': MagicMock(), 'showinfo': MagicMock()}
+    for name, mock in mocks.items():
+        monkeypatch.setattr(tkinter.messagebox, name, mock)
+    return mocks
+
+@pytest.fixture(autouse=True)
+def _reset_ui_manager(ui_manager_fixture):
+    """Clears everything the previous test left behind (panels are reset in conftest)."""
+    ui_manager, _, mock_scene_builder, mock_manim_interface, panels = ui_manager_fixture
+    # The stubs' method mocks are never truth-tested, so unlike the panels they can
+    # also drop configured return values without breaking __bool__
+    for mock in (mock_scene_builder, mock_manim_interface):
+        mock.reset_mock(return_value=True, side_effect=True)
+    ui_manager.selected_object_id = None
+    ui_manager.panels.clear()
+    ui_manager.panels.update(panels._asdict())
 
 # --- Test Class --- 
 class TestUIManager:
@@ -64,124 +111,81 @@ class TestUIManager:
         assert ui_manager.manim_interface is manim_interface
         assert ui_manager.selected_object_id is None
         assert len(ui_manager.panels) == 4 # Check all panels were registered
-        assert ui_manager.panels["timeline"] is panels["timeline"]
+        assert ui_manager.panels["timeline"] is panels.timeline
 
-    def test_handle_add_object_calls_scenebuilder_and_timeline_panel(self, ui_manager_fixture):
+    def test_handle_add_object_calls_scenebuilder_and_timeline_panel(self, ui_manager_fixture, spies):
         """Verify handle_add_object_request calls SceneBuilder and updates TimelinePanel.
         Red Step: Requires handle_add_object_request implementation.
         """
-        ui_manager, _, mock_scene_builder, _, panels = ui_manager_fixture
-        mock_timeline = panels['timeline']
-        mock_statusbar = panels['statusbar'] # Get status bar mock too
+        ui_manager, _, mock_scene_builder, _, _ = ui_manager_fixture
         
         # Configure mock SceneBuilder to return a dummy ID
-        dummy_id = "circle_test123"
+        dummy_id = sentinel.circle_id # Only passed through, never inspected
         mock_scene_builder.add_object.return_value = dummy_id
-        # Spy on the add_block method of the mock TimelinePanel
-        mock_timeline.add_block = MagicMock()
-        # Spy on status bar
-        mock_statusbar.set_status = MagicMock()
 
         # Call the handler
         object_type = "Circle"
         ui_manager.handle_add_object_request(object_type)
 
         # Assert SceneBuilder was called
-        mock_scene_builder.add_object.assert_called_once_with(object_type)
+        assert mock_scene_builder.add_object.call_count == 1
+        assert mock_scene_builder.add_object.call_args == ((object_type,), {})
 
         # Assert TimelinePanel was updated 
         # For now, assume a simple label format (this might change)
         # The exact label generation isn't the focus here, just the call.
-        mock_timeline.add_block.assert_called_once()
+        assert spies.add_block.call_count == 1
         # Check the first argument passed to add_block was the id
-        assert mock_timeline.add_block.call_args[0][0] == dummy_id 
+        assert spies.add_block.call_args[0][0] is dummy_id
         # We can refine the label check later if needed
-        assert isinstance(mock_timeline.add_block.call_args[0][1], str) 
+        assert isinstance(spies.add_block.call_args[0][1], str) 
 
         # Assert Status bar was updated (optional but good practice)
-        mock_statusbar.set_status.assert_called()
+        assert spies.set_status.call_count >= 1
 
-    def test_handle_timeline_selection_updates_properties_panel(self, ui_manager_fixture):
+    @pytest.mark.parametrize("obj_id,expected_props,expect_placeholder", [
+        ("circle_sel123", {'radius': 1.0, 'fill_color': '#FFFFFF'}, False),
+        ("square_sel456", {'side_length': 2.0, 'fill_color': '#00FF00'}, False),
+        (None, None, True), # Deselection
+    ])
+    def test_handle_timeline_selection_updates_properties_panel(self, ui_manager_fixture, spies, obj_id,
+                                                                expected_props, expect_placeholder):
         """Verify timeline selection updates internal state and PropertiesPanel.
         Red Step: Requires handle_timeline_selection implementation.
         """
-        ui_manager, _, mock_scene_builder, _, panels = ui_manager_fixture
-        mock_properties = panels['properties']
-        mock_statusbar = panels['statusbar']
+        ui_manager, _, mock_scene_builder, _, _ = ui_manager_fixture
         
         # --- Mock setup --- 
-        dummy_id_1 = "circle_sel123"
-        dummy_props_1 = {'radius': 1.0, 'fill_color': '#FFFFFF'}
-        dummy_id_2 = "square_sel456"
-        dummy_props_2 = {'side_length': 2.0, 'fill_color': '#00FF00'}
-        
-        # Configure SceneBuilder mock
-        def get_props_side_effect(obj_id):
-            if obj_id == dummy_id_1: return dummy_props_1
-            if obj_id == dummy_id_2: return dummy_props_2
-            return None
-        mock_scene_builder.get_object_properties.side_effect = get_props_side_effect
-        
-        # Spy on PropertiesPanel methods
-        mock_properties.display_properties = MagicMock()
-        mock_properties.show_placeholder = MagicMock()
-        mock_statusbar.set_status = MagicMock() # Reset mock for this test
+        # Configure SceneBuilder mock: known ID -> its props, anything else -> None
+        mock_scene_builder.get_object_properties.side_effect = {obj_id: expected_props}.get
 
-        # --- Test Selection 1 --- 
-        ui_manager.handle_timeline_selection(dummy_id_1)
-        
-        assert ui_manager.selected_object_id == dummy_id_1
-        mock_scene_builder.get_object_properties.assert_called_with(dummy_id_1)
-        mock_properties.display_properties.assert_called_once_with(dummy_id_1, dummy_props_1)
-        mock_properties.show_placeholder.assert_not_called()
-        mock_statusbar.set_status.assert_called() # Check status updated
-        status_call_args = mock_statusbar.set_status.call_args[0]
-        assert dummy_id_1 in status_call_args[0] # Status includes ID
-        
-        # Reset mocks for next check
-        mock_properties.display_properties.reset_mock()
-        mock_statusbar.set_status.reset_mock()
-        mock_scene_builder.get_object_properties.reset_mock()
+        ui_manager.handle_timeline_selection(obj_id)
+        
+        assert ui_manager.selected_object_id == obj_id
+        assert spies.set_status.call_count >= 1 # Check status updated
+        status_call_args = spies.set_status.call_args[0]
+        if expect_placeholder:
+            assert mock_scene_builder.get_object_properties.call_count == 0 # Shouldn't fetch props
+            assert spies.display_properties.call_count == 0
+            assert spies.show_placeholder.call_count == 1
+            assert "Deselected" in status_call_args[0] or "Ready" in status_call_args[0] # Status cleared
+        else:
+            assert mock_scene_builder.get_object_properties.call_args == ((obj_id,), {})
+            assert spies.display_properties.call_count == 1
+            assert spies.display_properties.call_args == ((obj_id, expected_props), {})
+            assert spies.show_placeholder.call_count == 0
+            assert obj_id in status_call_args[0] # Status includes ID
 
-        # --- Test Selection 2 --- 
-        ui_manager.handle_timeline_selection(dummy_id_2)
-        
-        assert ui_manager.selected_object_id == dummy_id_2
-        mock_scene_builder.get_object_properties.assert_called_with(dummy_id_2)
-        mock_properties.display_properties.assert_called_once_with(dummy_id_2, dummy_props_2)
-        mock_properties.show_placeholder.assert_not_called()
-        mock_statusbar.set_status.assert_called()
-        status_call_args = mock_statusbar.set_status.call_args[0]
-        assert dummy_id_2 in status_call_args[0]
-        
-        # Reset mocks
-        mock_properties.display_properties.reset_mock()
-        mock_statusbar.set_status.reset_mock()
-        mock_scene_builder.get_object_properties.reset_mock()
-
-        # --- Test Deselection --- 
-        ui_manager.handle_timeline_selection(None)
-        
-        assert ui_manager.selected_object_id is None
-        mock_scene_builder.get_object_properties.assert_not_called() # Shouldn't fetch props
-        mock_properties.display_properties.assert_not_called()
-        mock_properties.show_placeholder.assert_called_once()
-        mock_statusbar.set_status.assert_called()
-        status_call_args = mock_statusbar.set_status.call_args[0]
-        assert "Deselected" in status_call_args[0] or "Ready" in status_call_args[0] # Status cleared
-
-    def test_handle_property_change_updates_scenebuilder(self, ui_manager_fixture):
+    def test_handle_property_change_updates_scenebuilder(self, ui_manager_fixture, spies):
         """Verify property/animation changes call SceneBuilder update methods.
         Red Step: Requires handle_property_change and handle_animation_change.
         """
-        ui_manager, _, mock_scene_builder, _, panels = ui_manager_fixture
-        mock_statusbar = panels['statusbar']
-        mock_statusbar.set_status = MagicMock() # Spy on status bar
+        ui_manager, _, mock_scene_builder, _, _ = ui_manager_fixture
         
         # --- Test Property Change --- 
-        dummy_id = "circle_prop123"
+        dummy_id = sentinel.circle_id
         prop_key = "pos_x"
-        new_value = -3.14
+        new_value = sentinel.pos_x_value
         
         # Assume object is selected (though not strictly needed for this call)
         ui_manager.selected_object_id = dummy_id 
@@ -190,208 +194,124 @@ class TestUIManager:
         ui_manager.handle_property_change(dummy_id, prop_key, new_value)
         
         # Assert SceneBuilder was called correctly
-        mock_scene_builder.update_object_property.assert_called_once_with(
-            dummy_id, prop_key, new_value
-        )
-        mock_scene_builder.set_object_animation.assert_not_called() # Ensure wrong method wasn't called
-        mock_statusbar.set_status.assert_called() # Check status updated
+        assert mock_scene_builder.update_object_property.call_count == 1
+        assert mock_scene_builder.update_object_property.call_args == ((dummy_id, prop_key, new_value), {})
+        assert mock_scene_builder.set_object_animation.call_count == 0 # Ensure wrong method wasn't called
+        assert spies.set_status.call_count >= 1 # Check status updated
         
         # Reset mocks
         mock_scene_builder.reset_mock()
-        mock_statusbar.reset_mock()
+        spies.set_status.reset_mock()
 
         # --- Test Animation Change --- 
         anim_prop_key = "animation" # Although we have a dedicated handler
-        new_anim = "FadeIn"
+        new_anim = sentinel.animation
 
         # Call the dedicated handler for animation
         ui_manager.handle_animation_change(dummy_id, new_anim)
         
         # Assert SceneBuilder was called correctly
-        mock_scene_builder.set_object_animation.assert_called_once_with(dummy_id, new_anim)
-        mock_scene_builder.update_object_property.assert_not_called()
-        mock_statusbar.set_status.assert_called() # Check status updated
+        assert mock_scene_builder.set_object_animation.call_count == 1
+        assert mock_scene_builder.set_object_animation.call_args == ((dummy_id, new_anim), {})
+        assert mock_scene_builder.update_object_property.call_count == 0
+        assert spies.set_status.call_count >= 1 # Check status updated
 
-    def test_handle_refresh_preview_calls_scenebuilder_and_maniminterface(self, ui_manager_fixture):
-        """Verify refresh preview request coordinates script generation and render call.
-        Red Step: Requires handle_refresh_preview_request implementation.
+    @pytest.mark.parametrize("handler_name,script_type,flags,output_format,callback_attr,status_text", [
+        ("handle_refresh_preview_request", 'preview', PREVIEW_FLAGS, 'png', '_preview_callback', "Rendering preview"),
+        ("handle_render_video_request", 'render', RENDER_FLAGS, 'mp4', '_render_callback', "Rendering video"),
+    ])
+    def test_render_request_calls_scenebuilder_and_maniminterface(self, ui_manager_fixture, spies, handler_name, script_type,
+                                                                  flags, output_format, callback_attr, status_text):
+        """Verify preview/render requests coordinate script generation and the render call.
+        Red Step: Requires handle_refresh_preview_request and handle_render_video_request.
         """
-        ui_manager, _, mock_scene_builder, mock_manim_interface, panels = ui_manager_fixture
-        mock_preview = panels['preview']
-        mock_statusbar = panels['statusbar']
+        ui_manager, _, mock_scene_builder, mock_manim_interface, _ = ui_manager_fixture
         
         # --- Mock setup --- 
-        dummy_script = "# Preview Script"
-        dummy_scene = "PreviewScene"
+        dummy_script = sentinel.script
+        dummy_scene = sentinel.scene
         mock_scene_builder.generate_script.return_value = (dummy_script, dummy_scene)
-        
-        # Spy on methods
-        mock_preview.show_rendering_state = MagicMock()
-        mock_manim_interface.render_async = MagicMock()
-        mock_statusbar.set_status = MagicMock()
-        
+
         # --- Call handler --- 
-        ui_manager.handle_refresh_preview_request()
+        getattr(ui_manager, handler_name)()
         
         # --- Assertions --- 
         # 1. SceneBuilder called correctly
-        mock_scene_builder.generate_script.assert_called_once_with('preview')
+        assert mock_scene_builder.generate_script.call_count == 1
+        assert mock_scene_builder.generate_script.call_args == ((script_type,), {})
         
-        # 2. PreviewPanel state updated
-        mock_preview.show_rendering_state.assert_called_once()
-        mock_statusbar.set_status.assert_called() # Check status updated
+        # 2. PreviewPanel and status bar show the rendering state
+        assert spies.show_rendering_state.call_count == 1
+        assert spies.set_status.call_count >= 1
+        assert status_text in spies.set_status.call_args[0][0]
 
         # 3. ManimInterface called correctly
-        mock_manim_interface.render_async.assert_called_once()
+        assert mock_manim_interface.render_async.call_count == 1
         call_args, call_kwargs = mock_manim_interface.render_async.call_args
         
-        assert call_kwargs.get('script_content') == dummy_script
-        assert call_kwargs.get('scene_name') == dummy_scene
-        # Check for preview flags (as defined in architecture/checklist)
-        assert call_kwargs.get('quality_flags') == ['-s', '-ql'] 
-        assert call_kwargs.get('output_format') == 'png'
+        assert call_kwargs.get('script_content') is dummy_script
+        assert call_kwargs.get('scene_name') is dummy_scene
+        assert tuple(call_kwargs['quality_flags']) == flags
+        assert call_kwargs.get('output_format') == output_format
         # Check that the callback passed is the UIManager's internal method
-        assert call_kwargs.get('callback') == ui_manager._preview_callback
+        assert call_kwargs.get('callback') == getattr(ui_manager, callback_attr)
 
-    def test_preview_callback_success_updates_panel(self, ui_manager_fixture):
-        """Verify _preview_callback updates panel correctly on success.
-        Red Step: Requires implementation of _preview_callback success path.
+    @pytest.mark.parametrize("success,payload,mbox_attr,status_text", [
+        (True, b'imagedata', None, "Preview updated"),
+        (False, "Manim failed spectacularly!", 'showerror', "Preview failed"),
+    ])
+    def test_preview_callback_updates_panel(self, ui_manager_fixture, spies, mock_messagebox,
+                                           success, payload, mbox_attr, status_text):
+        """Verify _preview_callback updates the panel on success and shows an error on failure.
+        Red Step: Requires implementation of both _preview_callback paths.
         """
-        ui_manager, _, _, _, panels = ui_manager_fixture
-        mock_preview = panels['preview']
-        mock_statusbar = panels['statusbar']
-        
-        # Spy on panel methods
-        mock_preview.display_image = MagicMock()
-        mock_preview.show_idle_state = MagicMock()
-        mock_statusbar.set_status = MagicMock()
-        
-        dummy_image_bytes = b'imagedata'
-        
-        # Call the callback directly, simulating success
-        ui_manager._preview_callback(True, dummy_image_bytes)
-        
-        # Assert PreviewPanel methods called
-        mock_preview.display_image.assert_called_once_with(dummy_image_bytes)
-        mock_preview.show_idle_state.assert_called_once()
-        
-        # Assert Statusbar updated
-        mock_statusbar.set_status.assert_called_once()
-        status_message = mock_statusbar.set_status.call_args[0][0]
-        assert "Preview updated" in status_message or "success" in status_message.lower()
-
-    @patch('tkinter.messagebox.showerror') # Mock the showerror function
-    def test_preview_callback_failure_shows_error(self, mock_showerror, ui_manager_fixture):
-        """Verify _preview_callback handles failure correctly.
-        Red Step: Requires implementation of _preview_callback failure path.
-        """
-        ui_manager, _, _, _, panels = ui_manager_fixture
-        mock_preview = panels['preview']
-        mock_statusbar = panels['statusbar']
-        
-        # Spy on panel methods
-        mock_preview.show_idle_state = MagicMock()
-        mock_statusbar.set_status = MagicMock()
-        
-        dummy_error_message = "Manim failed spectacularly!"
-        
-        # Call the callback directly, simulating failure
-        ui_manager._preview_callback(False, dummy_error_message)
-        
-        # Assert messagebox.showerror was called
-        mock_showerror.assert_called_once()
-        # Check title and message passed to showerror
-        assert "Preview Failed" in mock_showerror.call_args[0][0] # Title check
-        assert dummy_error_message in mock_showerror.call_args[0][1] # Message check
+        ui_manager = ui_manager_fixture[0]
+
+        # Call the callback directly; only the failure path opens a messagebox
+        ui_manager._preview_callback(success, payload)
+        
+        if success:
+            assert spies.display_image.call_count == 1
+            assert spies.display_image.call_args == ((payload,), {})
+            assert mock_messagebox['showerror'].call_count == 0
+        else:
+            assert spies.display_image.call_count == 0
+            mock_mbox = mock_messagebox[mbox_attr]
+            assert mock_mbox.call_count == 1
+            # Check title and message passed to showerror
+            assert "Preview Failed" in mock_mbox.call_args[0][0] # Title check
+            assert payload in mock_mbox.call_args[0][1] # Message check
         
         # Assert PreviewPanel state reset
-        mock_preview.show_idle_state.assert_called_once()
+        assert spies.show_idle_state.call_count == 1
         
         # Assert Statusbar updated
-        mock_statusbar.set_status.assert_called_once()
-        status_message = mock_statusbar.set_status.call_args[0][0]
-        assert "Preview failed" in status_message or "error" in status_message.lower()
+        assert spies.set_status.call_count == 1
+        assert status_text in spies.set_status.call_args[0][0]
 
-    # --- Render Request and Callback Tests --- 
+    # --- Render Callback Tests --- 
 
-    def test_handle_render_video_request(self, ui_manager_fixture):
-        """Verify render request coordinates script generation and render call.
-        Red Step: Requires handle_render_video_request implementation.
+    @pytest.mark.parametrize("success,payload,mbox_attr,mbox_title,status_text", [
+        (True, "media/videos/render/480p/EasyManimScene.mp4", 'showinfo', "Render Complete", "Video render complete"),
+        (False, "Render exploded!", 'showerror', "Render Failed", "Video render failed"),
+    ])
+    def test_render_callback(self, ui_manager_fixture, spies, mock_messagebox,
+                             success, payload, mbox_attr, mbox_title, status_text):
+        """Verify _render_callback shows an info message on success and an error on failure.
+        Red Step: Requires both _render_callback paths.
         """
-        ui_manager, _, mock_scene_builder, mock_manim_interface, panels = ui_manager_fixture
-        mock_preview = panels['preview'] # May need to disable refresh btn
-        mock_statusbar = panels['statusbar']
-        
-        dummy_script = "# Render Script"
-        dummy_scene = "EasyManimScene"
-        mock_scene_builder.generate_script.return_value = (dummy_script, dummy_scene)
-        
-        # Spy on methods
-        # Assume Render button would be disabled elsewhere, potentially statusbar update is enough
-        mock_manim_interface.render_async = MagicMock()
-        mock_statusbar.set_status = MagicMock()
-        
-        ui_manager.handle_render_video_request()
-        
-        mock_scene_builder.generate_script.assert_called_once_with('render')
-        mock_statusbar.set_status.assert_called() # Check status updated (e.g., "Rendering video...")
-        status_message = mock_statusbar.set_status.call_args[0][0]
-        assert "Rendering video" in status_message
-        
-        mock_manim_interface.render_async.assert_called_once()
-        call_args, call_kwargs = mock_manim_interface.render_async.call_args
-        assert call_kwargs.get('script_content') == dummy_script
-        assert call_kwargs.get('scene_name') == dummy_scene
-        assert call_kwargs.get('quality_flags') == ['-ql'] # Render flags 
-        assert call_kwargs.get('output_format') == 'mp4'
-        assert call_kwargs.get('callback') == ui_manager._render_callback
-
-    @patch('tkinter.messagebox.showinfo')
-    def test_render_callback_success(self, mock_showinfo, ui_manager_fixture):
-        """Verify _render_callback handles success (shows info message).
-        Red Step: Requires _render_callback success path implementation.
-        """
-        ui_manager, _, _, _, panels = ui_manager_fixture
-        mock_statusbar = panels['statusbar']
-        mock_statusbar.set_status = MagicMock()
-        # Assume some UI elements might need state reset (e.g., buttons enabled)
-        mock_preview_panel = panels['preview'] # Example: preview panel button
-        mock_preview_panel.show_idle_state = MagicMock()
-
-        dummy_video_path = "media/videos/render/480p/EasyManimScene.mp4"
-        
-        ui_manager._render_callback(True, dummy_video_path)
-        
-        mock_showinfo.assert_called_once()
-        assert "Render Complete" in mock_showinfo.call_args[0][0] # Title
-        assert dummy_video_path in mock_showinfo.call_args[0][1] # Message includes path
-        
-        mock_statusbar.set_status.assert_called_once()
-        assert "Video render complete" in mock_statusbar.set_status.call_args[0][0]
-        assert dummy_video_path in mock_statusbar.set_status.call_args[0][0]
-        
-        mock_preview_panel.show_idle_state.assert_called_once() # Example state reset
+        ui_manager = ui_manager_fixture[0]
 
-    @patch('tkinter.messagebox.showerror')
-    def test_render_callback_failure(self, mock_showerror, ui_manager_fixture):
-        """Verify _render_callback handles failure (shows error message).
-        Red Step: Requires _render_callback failure path implementation.
-        """
-        ui_manager, _, _, _, panels = ui_manager_fixture
-        mock_statusbar = panels['statusbar']
-        mock_statusbar.set_status = MagicMock()
-        mock_preview_panel = panels['preview']
-        mock_preview_panel.show_idle_state = MagicMock()
-
-        dummy_error_msg = "Render exploded!"
+        ui_manager._render_callback(success, payload)
         
-        ui_manager._render_callback(False, dummy_error_msg)
+        mock_mbox = mock_messagebox[mbox_attr]
+        assert mock_mbox.call_count == 1
+        assert mbox_title in mock_mbox.call_args[0][0] # Title
+        assert payload in mock_mbox.call_args[0][1] # Message includes path or error
         
-        mock_showerror.assert_called_once()
-        assert "Render Failed" in mock_showerror.call_args[0][0] # Title
-        assert dummy_error_msg in mock_showerror.call_args[0][1] # Message
+        assert spies.set_status.call_count == 1
+        assert status_text in spies.set_status.call_args[0][0]
+        if success:
+            assert payload in spies.set_status.call_args[0][0]
         
-        mock_statusbar.set_status.assert_called_once()
-        assert "Video render failed" in mock_statusbar.set_status.call_args[0][0]
-
-        mock_preview_panel.show_idle_state.assert_called_once() # Example state reset
\ No newline at end of file
+        assert spies.show_idle_state.call_count == 1 # Reset regardless of outcome